@@ -0,0 +1,259 @@
+"""
+Нагрузочный прогон HTTP: задержки и пропускная способность по маршрутам.
+
+Проект поднимается через свой ``wsgi.py`` на временной базе SQLite с
+заполненными данными. Каждый именованный маршрут, кроме выхода из
+аккаунта, опрашивается из нескольких потоков анонимно и от имени
+пользователя. Итог печатается в JSON и при необходимости сравнивается
+с сохранённым прогоном.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.http_load ya_news --output news.json
+    python -m benchmarks.http_load ya_news --baseline news.json
+"""
+import argparse
+import http.client
+import importlib
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from urllib.parse import urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from benchmarks.utils import SETTINGS_MODULES, setup_django
+
+USERNAME = 'benchmark'
+MIXES = ('anonymous', 'user')
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    # Очередь по умолчанию (5) переполняется, и клиенты ждут повтора SYN.
+    request_queue_size = 128
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+def seed_news(rows):
+    """Новости с комментариями; у каждой новости по 10 комментариев."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.urls import reverse
+
+    from news.models import Comment, News
+
+    user = get_user_model().objects.create(username=USERNAME, is_staff=True)
+    with transaction.atomic():
+        News.objects.bulk_create(
+            News(title=f'Новость {index}', text=f'Текст новости {index}')
+            for index in range(rows)
+        )
+        Comment.objects.bulk_create(
+            Comment(news=news, author=user, text=f'Комментарий {index}')
+            for news in News.objects.all()
+            for index in range(10)
+        )
+        News.objects.refresh_comment_stats()
+    news = News.objects.first()
+    comment = news.comment_set.first()
+    routes = {
+        'news:home': reverse('news:home'),
+        'news:detail': reverse('news:detail', args=(news.pk,)),
+        'news:search': (
+            reverse('news:search') + '?' + urlencode({'q': 'новости'})
+        ),
+        'news:export': reverse('news:export'),
+        'news:feed': reverse('news:feed'),
+        'news:atom': reverse('news:atom'),
+        'news:edit': reverse('news:edit', args=(comment.pk,)),
+        'news:delete': reverse('news:delete', args=(comment.pk,)),
+    }
+    return user, routes
+
+
+def seed_notes(rows):
+    """Заметки одного пользователя."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    user = get_user_model().objects.create(username=USERNAME)
+    with transaction.atomic():
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text=f'Текст заметки {index}',
+                slug=f'note-{index}',
+                author=user,
+            )
+            for index in range(rows)
+        )
+    routes = {
+        'notes:home': reverse('notes:home'),
+        'notes:add': reverse('notes:add'),
+        'notes:edit': reverse('notes:edit', args=('note-0',)),
+        'notes:detail': reverse('notes:detail', args=('note-0',)),
+        'notes:delete': reverse('notes:delete', args=('note-0',)),
+        'notes:list': reverse('notes:list'),
+        'notes:search': (
+            reverse('notes:search') + '?' + urlencode({'q': 'заметки'})
+        ),
+        'notes:success': reverse('notes:success'),
+    }
+    return user, routes
+
+
+SEEDERS = {
+    'ya_news': seed_news,
+    'ya_note': seed_notes,
+}
+
+
+def session_cookie(user):
+    """Cookie сессии вошедшего пользователя."""
+    from django.conf import settings
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f'{name}={client.cookies[name].value}'
+
+
+def add_auth_routes(routes):
+    from django.urls import reverse
+
+    for name in ('users:login', 'users:signup'):
+        routes[name] = reverse(name)
+    return routes
+
+
+def fetch(port, path, headers):
+    """Один запрос; возвращает (статус, задержка в секундах)."""
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    try:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+    finally:
+        connection.close()
+    return response.status, time.perf_counter() - started
+
+
+def drive(port, path, headers, requests, threads):
+    """Прогоняет ``requests`` запросов к адресу из ``threads`` потоков."""
+    with ThreadPoolExecutor(threads) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(
+            lambda _: fetch(port, path, headers), range(requests)
+        ))
+        elapsed = time.perf_counter() - started
+    latencies = [latency for _, latency in results]
+    percentiles = statistics.quantiles(latencies, n=100)
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'p50_ms': round(percentiles[49] * 1000, 2),
+        'p95_ms': round(percentiles[94] * 1000, 2),
+        'p99_ms': round(percentiles[98] * 1000, 2),
+        'rps': round(requests / elapsed, 1),
+        'statuses': statuses,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Печатает изменения относительно прошлого прогона.
+
+    Возвращает число маршрутов, у которых p95 или пропускная способность
+    ухудшились больше чем на ``threshold``.
+    """
+    regressions = 0
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        p95 = current['p95_ms'] / previous['p95_ms'] - 1
+        rps = current['rps'] / previous['rps'] - 1
+        worse = p95 > threshold or rps < -threshold
+        regressions += worse
+        print(
+            f'{"!" if worse else " "} {key:<28} '
+            f'p95 {p95:+7.1%}  rps {rps:+7.1%}',
+            file=sys.stderr,
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('project', choices=SETTINGS_MODULES)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--baseline', type=Path)
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='Допустимое ухудшение относительно прошлого прогона.'
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(args.project, Path(directory) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.core.management import call_command
+
+        # Замеры ведутся без отладочного сбора запросов.
+        settings.DEBUG = False
+        call_command('migrate', verbosity=0)
+        user, routes = SEEDERS[args.project](args.rows)
+        routes = add_auth_routes(routes)
+        headers = {
+            'anonymous': {},
+            'user': {'Cookie': session_cookie(user)},
+        }
+        package = SETTINGS_MODULES[args.project].split('.')[0]
+        application = importlib.import_module(f'{package}.wsgi').application
+        server = make_server(
+            '127.0.0.1', 0, application,
+            server_class=ThreadingWSGIServer, handler_class=QuietHandler,
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        results = {}
+        try:
+            for mix in MIXES:
+                for name, path in routes.items():
+                    results[f'{mix} {name}'] = drive(
+                        port, path, headers[mix], args.requests, args.threads
+                    )
+        finally:
+            server.shutdown()
+            server.server_close()
+    report = json.dumps(results, ensure_ascii=False, indent=2)
+    print(report)
+    if args.output:
+        args.output.write_text(report, encoding='utf-8')
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
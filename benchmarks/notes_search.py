@@ -0,0 +1,144 @@
+"""
+Поиск по заметкам: FTS5 против LIKE-сканирования.
+
+Заметки распределены между пользователями по закону Ципфа, как в
+команде generate_notes, и поиск замеряется для пользователей с разным
+числом заметок. LIKE ищет по заголовку и тексту и сортирует все
+совпадения, как FTS5 перед ранжированием.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.notes_search --rows 1000000 --users 10000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+
+from benchmarks.utils import setup_django, timer
+
+SYLLABLES = 'ба ве ги до ку ла ме ни по ру са те фу ха це чи шо ю я'.split()
+VOCABULARY_SIZE = 20_000
+# Ранги слов в частотном словаре: от частых к редким.
+QUERY_RANKS = ((10,), (200,), (5_000,), (200, 5_000))
+# Пользователи по числу заметок: самый активный, типичный и редкий.
+# Место в рейтинге задано долей от числа пользователей.
+AUTHOR_RANKS = (('активный', 0), ('типичный', 0.01), ('редкий', 0.5))
+
+
+def vocabulary(rng):
+    """Словарь из выдуманных слов с частотами по закону Ципфа."""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    weights = list(accumulate(
+        1 / rank for rank in range(1, VOCABULARY_SIZE + 1)
+    ))
+    return words, weights
+
+
+def fill(rows, users, batch_size, rng, words, weights):
+    """Заполняет базу; возвращает id пользователей от самого активного."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+
+    from notes.management.commands.generate_notes import zipf_weights
+    from notes.models import Note
+
+    User = get_user_model()
+
+    def choose(count):
+        return ' '.join(rng.choices(words, cum_weights=weights, k=count))
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        User.objects.bulk_create(
+            User(username=f'benchmark_{index}', password='!')
+            for index in range(users)
+        )
+        user_ids = list(
+            User.objects.order_by('pk').values_list('pk', flat=True)
+        )
+        rng.shuffle(user_ids)
+        author_weights = zipf_weights(len(user_ids))
+        for start in range(0, rows, batch_size):
+            authors = rng.choices(
+                user_ids,
+                cum_weights=author_weights,
+                k=min(batch_size, rows - start),
+            )
+            Note.objects.bulk_create(
+                Note(
+                    title=choose(3),
+                    text=choose(40),
+                    slug=f'note-{start + index}',
+                    author_id=author_id,
+                )
+                for index, author_id in enumerate(authors)
+            )
+    print(
+        f'Заполнено {rows} заметок {users} пользователей '
+        f'за {time.perf_counter() - started:.1f} с'
+    )
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django('ya_note', Path(directory) / 'bench.sqlite3')
+        from django.contrib.auth import get_user_model
+        from django.core.management import call_command
+        from django.db.models import Q
+
+        from notes.models import Note
+        from notes.search import optimize_search_index, search_notes
+
+        call_command('migrate', verbosity=0)
+        rng = random.Random(args.seed)
+        words, weights = vocabulary(rng)
+        user_ids = fill(
+            args.rows, args.users, args.batch_size, rng, words, weights
+        )
+        optimize_search_index()
+        results = {}
+        for label, share in AUTHOR_RANKS:
+            author = get_user_model().objects.get(
+                pk=user_ids[int(share * (len(user_ids) - 1))]
+            )
+            count = Note.objects.filter(author=author).count()
+            print(f'Пользователь «{label}»: {count} заметок')
+            for ranks in QUERY_RANKS:
+                query = ' '.join(words[rank - 1] for rank in ranks)
+                like = Note.objects.filter(author=author).only('title')
+                for word in query.split():
+                    like = like.filter(
+                        Q(title__icontains=word) | Q(text__icontains=word)
+                    )
+                # У LIKE нет релевантности, но сортировка, как и ранжирование
+                # в FTS5, требует найти все совпадения, а не первые limit.
+                like = like.order_by('title')[:args.limit]
+                for _ in range(args.repeat):
+                    with timer(results, f'fts5 {label} {query!r}'):
+                        list(search_notes(author, query, args.limit))
+                    with timer(results, f'like {label} {query!r}'):
+                        list(like.all())
+        for name, timings in results.items():
+            median = statistics.median(timings) * 1000
+            print(f'{name:<44} медиана {median:9.2f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Сравнение фильтра запрещённых слов с прежней проверкой в цикле.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.profanity
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'ya_news'))
+
+from news.profanity import SMALL_WORD_LIST, WordMatcher  # noqa: E402
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+TERM_COUNTS = (10, 1_000, 50_000)
+
+
+def loop_search(words, text):
+    """Прежняя проверка из CommentForm.clean_text."""
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+def random_word(rng, min_length, max_length):
+    return ''.join(
+        rng.choice(ALPHABET)
+        for _ in range(rng.randint(min_length, max_length))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--text-length', type=int, default=2_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    # Чистый текст — худший случай: обе проверки просматривают его целиком.
+    words = ' '.join(
+        random_word(rng, 2, 6) for _ in range(args.text_length // 4)
+    )
+    text = words[:args.text_length]
+    print(
+        f'{"слов":>8} {"цикл, мс":>12} {"автомат, мс":>12} '
+        f'{"сборка, мс":>12}'
+    )
+    for count in TERM_COUNTS:
+        terms = [random_word(rng, 7, 12) for _ in range(count)]
+        build = timeit.timeit(lambda: WordMatcher(terms), number=1)
+        matcher = WordMatcher(terms)
+        assert matcher.search(text) == loop_search(terms, text)
+        loop = min(timeit.repeat(
+            lambda: loop_search(terms, text), number=1, repeat=args.repeat
+        ))
+        automaton = min(timeit.repeat(
+            lambda: matcher.search(text), number=1, repeat=args.repeat
+        ))
+        # На коротком списке WordMatcher не строит автомат и сам
+        # проверяет слова в цикле, поэтому обе колонки меряют цикл.
+        note = ' *' if count <= SMALL_WORD_LIST else ''
+        print(
+            f'{count:>8} {loop * 1000:>12.3f} {automaton * 1000:>12.3f} '
+            f'{build * 1000:>12.1f}{note}'
+        )
+    print(
+        f'* не больше {SMALL_WORD_LIST} слов: автомат не строится, '
+        'WordMatcher проверяет слова в цикле.'
+    )
+
+
+if __name__ == '__main__':
+    main()
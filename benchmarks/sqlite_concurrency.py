@@ -0,0 +1,161 @@
+"""
+SQLite под нагрузкой: запись комментариев одновременно с чтением главной.
+
+Сравниваются настройки SQLite по умолчанию (журнал отката, новое
+соединение на каждый запрос) и настройки проекта (WAL, SQLITE_PRAGMAS,
+постоянные соединения). Каждый режим запускается в отдельном процессе
+на своей временной базе.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.sqlite_concurrency --writers 4 --readers 8
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.utils import setup_django
+
+MODES = ('default', 'tuned')
+
+
+def seed(news_count):
+    from django.contrib.auth import get_user_model
+
+    from news.models import News
+
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст новости')
+        for index in range(news_count)
+    )
+    user_model = get_user_model()
+    user_model.objects.create(username='reader')
+    user_model.objects.create(username='writer')
+
+
+def writer(stats, deadline, news_ids):
+    """Пишет комментарии так же, как представление новости."""
+    from django.contrib.auth import get_user_model
+    from django.db import close_old_connections, transaction
+
+    from news.models import Comment
+
+    author = get_user_model().objects.get(username='writer')
+    index = 0
+    while time.perf_counter() < deadline:
+        close_old_connections()
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                Comment.objects.create(
+                    news_id=news_ids[index % len(news_ids)],
+                    author=author,
+                    text=f'Комментарий {index}',
+                )
+        except Exception as error:
+            stats['errors'].append(repr(error))
+        else:
+            stats['writes'].append(time.perf_counter() - started)
+        close_old_connections()
+        index += 1
+
+
+def reader(stats, deadline):
+    """Открывает главную от имени пользователя, минуя кеш страниц."""
+    from django.contrib.auth import get_user_model
+    from django.db import close_old_connections
+    from django.test import Client
+
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(get_user_model().objects.get(username='reader'))
+    while time.perf_counter() < deadline:
+        close_old_connections()
+        started = time.perf_counter()
+        try:
+            response = client.get('/')
+        except Exception as error:
+            stats['errors'].append(repr(error))
+        else:
+            if response.status_code == 200:
+                stats['reads'].append(time.perf_counter() - started)
+            else:
+                stats['errors'].append(response.status_code)
+        close_old_connections()
+
+
+def run_mode(args):
+    """Прогон одного режима; итог печатается в stdout как JSON."""
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django('ya_news', Path(directory) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.core.management import call_command
+        from django.db import connection
+
+        settings.DEBUG = False
+        if args.mode == 'default':
+            settings.SQLITE_PRAGMAS = {}
+            settings.DATABASES['default']['CONN_MAX_AGE'] = 0
+        call_command('migrate', verbosity=0)
+        seed(args.news)
+        from news.models import News
+
+        news_ids = list(News.objects.values_list('pk', flat=True))
+        connection.close()
+        stats = {'reads': [], 'writes': [], 'errors': []}
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=writer, args=(stats, deadline, news_ids))
+            for _ in range(args.writers)
+        ] + [
+            threading.Thread(target=reader, args=(stats, deadline))
+            for _ in range(args.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    result = {'mode': args.mode, 'errors': len(stats['errors'])}
+    for kind in ('reads', 'writes'):
+        timings = stats[kind]
+        result[f'{kind}_per_s'] = round(len(timings) / args.duration, 1)
+        if len(timings) > 1:
+            p95 = statistics.quantiles(timings, n=100)[94]
+            result[f'{kind}_p95_ms'] = round(p95 * 1000, 2)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--news', type=int, default=100)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args)
+        return
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite_concurrency',
+             '--mode', mode] + sys.argv[1:],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(
+            f'{mode:<8} чтений/с {result["reads_per_s"]:8.1f} '
+            f'(p95 {result.get("reads_p95_ms", 0):7.1f} мс)  '
+            f'записей/с {result["writes_per_s"]:8.1f} '
+            f'(p95 {result.get("writes_p95_ms", 0):7.1f} мс)  '
+            f'ошибок {result["errors"]}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SETTINGS_MODULES = {
+    'ya_news': 'yanews.settings',
+    'ya_note': 'yanote.settings',
+}
+
+
+def setup_django(project, database):
+    """
+    Настраивает Django проекта на отдельный файл базы SQLite.
+
+    Рабочая база проекта не затрагивается.
+    """
+    sys.path.insert(0, str(BASE_DIR / project))
+    os.environ['DJANGO_SETTINGS_MODULE'] = SETTINGS_MODULES[project]
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = str(database)
+    django.setup()
+
+
+@contextmanager
+def timer(results, name):
+    """Добавляет в ``results[name]`` время выполнения блока в секундах."""
+    started = time.perf_counter()
+    yield
+    results.setdefault(name, []).append(time.perf_counter() - started)
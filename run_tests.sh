@@ -14,6 +14,29 @@ print_message () {
     echo -e "${left_filler_len// /$symbol}$message${right_filler_len// /$symbol}\033[0m"
 }
 
+run_tests () {
+    # Run pytest for the project (first argument) with the settings module
+    # (second argument), writing the whole output to a file (third argument).
+    # Tests are spread over PYTEST_WORKERS processes, one per core by default;
+    # each worker gets its own in-memory SQLite database. PYTEST_WORKERS=0
+    # runs the suite in a single process.
+    local workers=${PYTEST_WORKERS:-auto}
+    local xdist=(-n "$workers" --dist loadfile)
+    if [[ $workers == 0 ]]; then xdist=(); fi
+    cd "$1" || return
+    DJANGO_SETTINGS_MODULE="$2" exec pytest --tb=line "${xdist[@]}" > "$3" 2>&1
+}
+
+output_dir=$(mktemp -d)
+trap 'rm -rf "$output_dir"' EXIT
+
+# Both suites start right away and run alongside flake8 and each other;
+# their results are reported only after the checks above them pass.
+run_tests "ya_news" "${DJANGO_SETTINGS_MODULE:="yanews.settings_test"}" "$output_dir/ya_news" &
+news_pid=$!
+run_tests "ya_note" "yanote.settings_test" "$output_dir/ya_note" &
+note_pid=$!
+
 
 if python -m flake8 --config=setup.cfg 1>&2;
 then
@@ -21,36 +44,33 @@ then
     echo $LF 1>&2
     if python structure_test.py
     then
-        cd ya_news
-        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings"}"
-        if pytest --tb=line 1>&2;
-        then
-            cd ../ya_note
-            unset DJANGO_SETTINGS_MODULE
-            export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanote.settings"}"
-            if pytest --tb=line 1>&2;
-            then
-                exit 0
-            else
-                status=$?
-                print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
-                echo \`\`\` 1>&2
-                exit $status
-            fi
-        else
-            status=$?
+        wait $news_pid
+        news_status=$?
+        wait $note_pid
+        note_status=$?
+        cat "$output_dir/ya_news" "$output_dir/ya_note" 1>&2
+        if [[ $news_status -ne 0 ]]; then
             print_message " При запуске упали ваши тесты для проекта YaNews. Проверьте тесты этого проекта " "=" 1
+        fi
+        if [[ $note_status -ne 0 ]]; then
+            print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
+        fi
+        if [[ $news_status -ne 0 || $note_status -ne 0 ]]; then
             echo \`\`\` 1>&2
-            exit $status
+            if [[ $news_status -ne 0 ]]; then exit $news_status; fi
+            exit $note_status
         fi
+        exit 0
     else
         status=$?
+        kill $news_pid $note_pid 2>/dev/null
         print_message " Убедитесь, что написанные вами тесты скопированы в указанные в ТЗ директории " "=" 1
         echo \`\`\` 1>&2
         exit $status
     fi
 else
     status=$?
+    kill $news_pid $note_pid 2>/dev/null
     print_message " flake8 обнаружил отклонения от стандартов, приведите код в соответствие с PEP8 " "=" 1
     echo \`\`\` 1>&2
     exit $status
@@ -13,3 +13,4 @@ class NewsAdmin(admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+    list_display = ('title', 'date', 'comment_count', 'last_comment_at')
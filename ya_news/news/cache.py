@@ -0,0 +1,225 @@
+import hashlib
+import time
+from collections import namedtuple
+from contextlib import nullcontext
+from http import HTTPStatus
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, quote_etag
+
+from yanews.routers import primary_reads
+from .pagination import decode_cursor, paginate_comments
+
+NEWS_VERSION_KEY = 'news:{pk}:version'
+NEWS_LIST_VERSION_KEY = 'news:version'
+COMMENT_BLOCK_KEY = 'news:{pk}:{version}:comments:{size}:{cursor}'
+PAGE_KEY = 'page:{digest}'
+PAGE_LOCK_KEY = 'page:{digest}:lock'
+# Сколько версий удалять одним запросом к кешу.
+VERSION_BATCH_SIZE = 500
+
+RenderedComment = namedtuple('RenderedComment', ('pk', 'author_id', 'html'))
+
+
+def new_version():
+    """
+    Новая версия: время её появления и случайный токен.
+
+    Токен нужен, чтобы после вытеснения ключа из кеша новая версия не
+    совпала ни с одной из прежних, время — для ``fill_reads``.
+    """
+    return f'{time.time():.3f}-{uuid4().hex}'
+
+
+def get_version(key):
+    """Версия кешированных данных по ключу."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def fill_reads(version):
+    """
+    Откуда читать данные для записи в кеш под версией ``version``.
+
+    Реплики отстают не больше чем на ``REPLICA_PIN_SECONDS`` — на этом
+    держится и привязка пользователя к основной базе после записи.
+    Пока версии меньше этого срока, реплика может не знать о записи,
+    которая её сменила, и кеш заполняется из основной базы. Потом
+    чтение остаётся на реплике текущего запроса.
+    """
+    created, _, _ = version.partition('-')
+    try:
+        age = time.time() - float(created)
+    except ValueError:
+        age = 0
+    if age < settings.REPLICA_PIN_SECONDS:
+        return primary_reads()
+    return nullcontext()
+
+
+def get_news_version(pk):
+    """Версия отдельной новости."""
+    return get_version(NEWS_VERSION_KEY.format(pk=pk))
+
+
+def get_news_list_version():
+    """Версия всех новостей сразу, меняется при любой записи."""
+    return get_version(NEWS_LIST_VERSION_KEY)
+
+
+def bump_news_version(pk):
+    """Делает устаревшими все кешированные данные новости и списка."""
+    cache.set_many(
+        {
+            NEWS_VERSION_KEY.format(pk=pk): new_version(),
+            NEWS_LIST_VERSION_KEY: new_version(),
+        },
+        None
+    )
+
+
+def bump_news_versions(pks):
+    """
+    Делает устаревшими кешированные данные многих новостей и списка.
+
+    Для записи в обход сигналов. Версии новостей удаляются, а не
+    перезаписываются: следующее чтение создаст новую, а кеш не
+    заполняется ключами новостей, которые никто не открывал.
+    """
+    pks = list(pks)
+    for start in range(0, len(pks), VERSION_BATCH_SIZE):
+        cache.delete_many([
+            NEWS_VERSION_KEY.format(pk=pk)
+            for pk in pks[start:start + VERSION_BATCH_SIZE]
+        ])
+    cache.set(NEWS_LIST_VERSION_KEY, new_version(), None)
+
+
+def get_comment_block(news, cursor):
+    """
+    Порция комментариев к новости, отрисованная без учёта пользователя.
+
+    Возвращает пару (комментарии, курсор следующей порции). Ссылки на
+    редактирование и удаление добавляет шаблон по ``author_id``.
+    Для некорректного курсора выбрасывает ValueError.
+    """
+    if cursor:
+        decode_cursor(cursor)
+    size = settings.COMMENTS_COUNT_ON_NEWS_PAGE
+    version = get_news_version(news.pk)
+    key = COMMENT_BLOCK_KEY.format(
+        pk=news.pk,
+        version=version,
+        size=size,
+        cursor=cursor or '',
+    )
+    block = cache.get(key)
+    if block is None:
+        with fill_reads(version):
+            comments, next_cursor = paginate_comments(
+                news.comment_set.select_related('author'), cursor, size
+            )
+        block = (
+            [
+                RenderedComment(
+                    comment.pk,
+                    comment.author_id,
+                    render_to_string(
+                        'includes/comment.html', {'comment': comment}
+                    ),
+                )
+                for comment in comments
+            ],
+            next_cursor,
+        )
+        cache.set(key, block, settings.COMMENT_BLOCK_CACHE_TIMEOUT)
+    return block
+
+
+def get_cached_page(key, version, render_page):
+    """
+    Страница из кеша или результат ``render_page``.
+
+    Устаревшую копию перерисовывает только тот процесс, который первым
+    захватил блокировку; остальные в это время отдают устаревшую копию.
+    Копии хранятся дольше срока свежести, чтобы было что отдавать.
+    ETag ответа — версия, по которой построена отданная копия, а не
+    текущая: иначе устаревшая копия закрепилась бы у клиентов ответами 304.
+    """
+    digest = hashlib.md5(key.encode()).hexdigest()
+    page_key = PAGE_KEY.format(digest=digest)
+    lock_key = PAGE_LOCK_KEY.format(digest=digest)
+    page = cache.get(page_key)
+    if page is not None:
+        if page['version'] == version and page['expires'] > time.time():
+            return page_response(page)
+        if not cache.add(lock_key, True, settings.PAGE_CACHE_LOCK_TIMEOUT):
+            return page_response(page)
+    try:
+        with fill_reads(version):
+            response = render_page()
+        if response.status_code == HTTPStatus.OK:
+            cache.set(
+                page_key,
+                {
+                    'version': version,
+                    'expires': time.time() + settings.PAGE_CACHE_TIMEOUT,
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                },
+                settings.PAGE_CACHE_TIMEOUT + settings.PAGE_CACHE_STALE_TIMEOUT
+            )
+            response['ETag'] = quote_etag(version)
+        else:
+            cache.delete(page_key)
+    finally:
+        if page is not None:
+            cache.delete(lock_key)
+    return response
+
+
+def page_response(page):
+    response = HttpResponse(page['content'], content_type=page['content_type'])
+    response['ETag'] = quote_etag(page['version'])
+    return response
+
+
+class AnonymousPageCacheMixin:
+    """
+    Кеширует страницу целиком для анонимных пользователей.
+
+    На условный запрос с ETag отданной копии отвечает 304. Версия
+    страницы читается из кеша один раз за запрос.
+    """
+
+    def get_page_version(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        def render_page():
+            response = super(AnonymousPageCacheMixin, self).dispatch(
+                request, *args, **kwargs
+            )
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+
+        response = get_cached_page(
+            request.get_full_path(), self.get_page_version(), render_page
+        )
+        return get_conditional_response(
+            request, etag=response.get('ETag'), response=response
+        )
@@ -0,0 +1,86 @@
+import csv
+import json
+from io import StringIO
+
+from .models import Comment, News
+
+FIELDS = (
+    'news_id',
+    'news_title',
+    'news_date',
+    'comment_id',
+    'comment_author',
+    'comment_created',
+    'comment_text',
+)
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def iter_rows(chunk_size):
+    """
+    Строки выгрузки: по одной на комментарий, новости без комментариев —
+    одной строкой с пустыми полями комментария.
+
+    Новости читаются по возрастанию id, комментарии — в порядке
+    (news_id, created, id) по индексу. Оба запроса читаются порциями и
+    сливаются на лету, поэтому выгрузка не собирается в памяти.
+    """
+    news_rows = News.objects.order_by('pk').values_list(
+        'pk', 'title', 'date'
+    ).iterator(chunk_size=chunk_size)
+    comment_rows = Comment.objects.order_by(
+        'news_id', 'created', 'pk'
+    ).values_list(
+        'news_id', 'pk', 'author__username', 'created', 'text'
+    ).iterator(chunk_size=chunk_size)
+    comment = next(comment_rows, None)
+    for news_id, title, date in news_rows:
+        news = {
+            'news_id': news_id,
+            'news_title': title,
+            'news_date': date.isoformat(),
+        }
+        has_comments = False
+        while comment is not None and comment[0] == news_id:
+            _, comment_id, author, created, text = comment
+            has_comments = True
+            yield {
+                **news,
+                'comment_id': comment_id,
+                'comment_author': author,
+                'comment_created': created.isoformat(),
+                'comment_text': text,
+            }
+            comment = next(comment_rows, None)
+        if not has_comments:
+            yield {**news, **dict.fromkeys(FIELDS[3:])}
+
+
+def csv_lines(rows):
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def export_lines(export_format, chunk_size):
+    """Строки выгрузки в формате ``csv`` или ``jsonl``."""
+    rows = iter_rows(chunk_size)
+    if export_format == 'csv':
+        return csv_lines(rows)
+    return jsonl_lines(rows)
@@ -0,0 +1,97 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.views.decorators.http import condition
+
+from .cache import fill_reads, get_news_list_version
+from .models import News
+
+FEED_KEY = 'feed:{name}:{version}'
+SLASH_NAMESPACE = 'http://purl.org/rss/1.0/modules/slash/'
+
+
+class CommentCountMixin:
+    """Добавляет в элементы ленты число комментариев (``slash:comments``)."""
+
+    def root_attributes(self):
+        attrs = super().root_attributes()
+        attrs['xmlns:slash'] = SLASH_NAMESPACE
+        return attrs
+
+    def add_item_elements(self, handler, item):
+        super().add_item_elements(handler, item)
+        handler.addQuickElement('slash:comments', str(item['comment_count']))
+
+
+class RssFeedGenerator(CommentCountMixin, Rss201rev2Feed):
+    pass
+
+
+class AtomFeedGenerator(CommentCountMixin, Atom1Feed):
+    pass
+
+
+class LatestNewsFeed(Feed):
+    """Последние новости с числом комментариев."""
+    feed_type = RssFeedGenerator
+    title = 'YaNews'
+    link = reverse_lazy('news:home')
+    description = 'Последние новости YaNews.'
+
+    def items(self):
+        return News.objects.order_by('-date')[:settings.NEWS_COUNT_IN_FEED]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('news:detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return datetime.combine(
+            item.date, time.min, timezone.get_current_timezone()
+        )
+
+    def item_extra_kwargs(self, item):
+        return {'comment_count': item.comment_count}
+
+
+class LatestNewsAtomFeed(LatestNewsFeed):
+    feed_type = AtomFeedGenerator
+    subtitle = LatestNewsFeed.description
+
+
+def feed_etag(request):
+    return get_news_list_version()
+
+
+def cached_feed(feed, name):
+    """
+    Представление ленты, которое отдаёт XML из кеша.
+
+    Версия списка новостей входит в ключ, поэтому лента перестраивается
+    только после изменения новости или комментария. Та же версия
+    служит ETag для условных запросов.
+    """
+    @condition(etag_func=feed_etag)
+    def view(request):
+        version = get_news_list_version()
+        key = FEED_KEY.format(name=name, version=version)
+        page = cache.get(key)
+        if page is None:
+            with fill_reads(version):
+                response = feed(request)
+            page = (response.content, response['Content-Type'])
+            cache.set(key, page, settings.FEED_CACHE_TIMEOUT)
+        content, content_type = page
+        return HttpResponse(content, content_type=content_type)
+    return view
@@ -1,7 +1,9 @@
+from django.conf import settings
 from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
 from .models import Comment
+from .profanity import BadWordsFilter
 
 BAD_WORDS = (
     'редиска',
@@ -10,6 +12,8 @@ BAD_WORDS = (
 )
 WARNING = 'Не ругайтесь!'
 
+bad_words_filter = BadWordsFilter(BAD_WORDS, settings.BAD_WORDS_FILE)
+
 
 class CommentForm(ModelForm):
 
@@ -20,8 +24,6 @@ class CommentForm(ModelForm):
     def clean_text(self):
         """Не позволяем ругаться в комментариях."""
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        if bad_words_filter.search(text) is not None:
+            raise ValidationError(WARNING)
         return text
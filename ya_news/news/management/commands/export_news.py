@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.export import FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Выгружает новости вместе с комментариями в CSV или JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=FORMATS, default='jsonl',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько строк читать из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(options['format'], options['chunk_size'])
+        started = time.monotonic()
+        if options['output'] == '-':
+            count = self.export(lines, self.stdout)
+        else:
+            with open(
+                options['output'], 'w', encoding='utf-8', newline=''
+            ) as output:
+                count = self.export(lines, output)
+        elapsed = max(time.monotonic() - started, 1e-9)
+        # Итог идёт в stderr, чтобы не смешиваться с выгрузкой.
+        self.stderr.write(
+            f'Выгружено {count} строк, {count / elapsed:.0f} строк/с'
+        )
+
+    def export(self, lines, output):
+        count = 0
+        for line in lines:
+            output.write(line)
+            count += 1
+        return count
@@ -0,0 +1,225 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from news.cache import bump_news_versions
+from news.models import Comment, News
+from news.search import optimize_search_index
+
+User = get_user_model()
+
+WORDS = (
+    'город власти новый проект жители район школа дорога парк мост '
+    'выставка концерт погода снег дождь весна лето осень зима матч '
+    'команда победа сезон театр премьера музей библиотека больница '
+    'автобус метро станция ремонт строительство праздник фестиваль '
+    'улица площадь рынок цены магазин компания завод выборы депутат'
+).split()
+# За сколько дней после публикации новость собирает комментарии.
+COMMENT_DAYS = 30
+UPDATE_COMMENT_CREATED = 'UPDATE news_comment SET created = %s WHERE id = %s'
+
+
+@contextmanager
+def relaxed_pragmas():
+    """
+    Отключает синхронную запись SQLite на время загрузки.
+
+    При сбое посреди загрузки база может потерять последние транзакции,
+    поэтому настройки возвращаются сразу после неё. Внутри открытой
+    транзакции SQLite не даёт их менять, и загрузка идёт как обычно.
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        synchronous = cursor.fetchone()[0]
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+        cursor.execute('PRAGMA synchronous = OFF')
+        cursor.execute('PRAGMA journal_mode = MEMORY')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA synchronous = {synchronous}')
+            cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+
+
+def zipf_weights(size):
+    """Накопленные веса, при которых k-й элемент в k раз реже первого."""
+    return list(accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими новостями, пользователями и '
+        'комментариями. Комментарии распределены неравномерно: немногие '
+        'новости и пользователи собирают большую их часть. При одинаковом '
+        'seed данные получаются одинаковыми.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=100_000)
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Сколько строк создавать одним запросом.'
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=200_000,
+            help='Сколько строк сохранять в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.transaction_size = options['transaction_size']
+        self.started = time.monotonic()
+        with relaxed_pragmas():
+            user_ids = self.create_users(options['users'], options['seed'])
+            news_dates = self.create_news(options['news'])
+            self.create_comments(options['comments'], news_dates, user_ids)
+            News.objects.refresh_comment_stats()
+            optimize_search_index()
+        # Загрузка идёт в обход сигналов, поэтому кеш сбрасывается здесь.
+        bump_news_versions(news_dates)
+        self.stdout.write(self.style.SUCCESS(self.progress('Готово')))
+
+    def bulk_create(self, model, objects, total, label):
+        """Сохраняет объекты пачками, по несколько пачек в транзакции."""
+        created = 0
+        while created < total:
+            with transaction.atomic():
+                limit = min(total, created + self.transaction_size)
+                while created < limit:
+                    size = min(self.batch_size, limit - created)
+                    model.objects.bulk_create(
+                        next(objects) for _ in range(size)
+                    )
+                    created += size
+            self.stdout.write(
+                self.progress(f'{label}: {created}')
+            )
+
+    def create_users(self, count, seed):
+        prefix = f'gen{seed}_'
+        self.bulk_create(
+            User,
+            (
+                User(username=f'{prefix}{index}', password='!')
+                for index in range(count)
+            ),
+            count,
+            'Пользователи',
+        )
+        return list(
+            User.objects.filter(username__startswith=prefix)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_news(self, count):
+        last_id = News.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        today = date.today()
+        self.bulk_create(
+            News,
+            (
+                News(
+                    title=self.sentence(3, 6)[:50],
+                    text=self.sentence(30, 200),
+                    date=today - timedelta(days=self.rng.randrange(3650)),
+                )
+                for _ in range(count)
+            ),
+            count,
+            'Новости',
+        )
+        return dict(
+            News.objects.filter(pk__gt=last_id)
+            .order_by('pk').values_list('pk', 'date')
+        )
+
+    def create_comments(self, count, news_dates, user_ids):
+        last_id = Comment.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        news_ids = list(news_dates)
+        # Популярность не должна совпадать с порядком создания.
+        self.rng.shuffle(news_ids)
+        self.rng.shuffle(user_ids)
+        news_weights = zipf_weights(len(news_ids))
+        user_weights = zipf_weights(len(user_ids))
+
+        def comments():
+            while True:
+                news = self.rng.choices(
+                    news_ids, cum_weights=news_weights, k=self.batch_size
+                )
+                authors = self.rng.choices(
+                    user_ids, cum_weights=user_weights, k=self.batch_size
+                )
+                for news_id, author_id in zip(news, authors):
+                    yield Comment(
+                        news_id=news_id,
+                        author_id=author_id,
+                        text=self.sentence(3, 40),
+                    )
+
+        self.bulk_create(Comment, comments(), count, 'Комментарии')
+        self.spread_comment_times(last_id, news_dates)
+
+    def spread_comment_times(self, last_id, news_dates):
+        """
+        Разносит время комментариев по дням после публикации новостей.
+
+        ``created`` заполняется автоматически при сохранении, поэтому
+        без этого у всех комментариев было бы время загрузки. Время
+        записывается одним подготовленным запросом на пачку: bulk_update
+        строит CASE на каждую строку и здесь в десятки раз медленнее.
+        """
+        now = timezone.now()
+        adapt = connection.ops.adapt_datetimefield_value
+        published = {
+            pk: timezone.make_aware(datetime.combine(day, datetime.min.time()))
+            for pk, day in news_dates.items()
+        }
+        spread = COMMENT_DAYS * 24 * 60 * 60
+        updated = 0
+        while True:
+            with transaction.atomic():
+                comments = list(
+                    Comment.objects.filter(pk__gt=last_id).order_by('pk')
+                    .values_list('pk', 'news_id')[:self.transaction_size]
+                )
+                if not comments:
+                    break
+                params = []
+                for pk, news_id in comments:
+                    created = published[news_id] + timedelta(
+                        seconds=self.rng.randrange(spread)
+                    )
+                    params.append((adapt(min(now, created)), pk))
+                with connection.cursor() as cursor:
+                    cursor.executemany(UPDATE_COMMENT_CREATED, params)
+            last_id = comments[-1][0]
+            updated += len(comments)
+            self.stdout.write(self.progress(f'Время комментариев: {updated}'))
+
+    def sentence(self, shortest, longest):
+        words = self.rng.choices(WORDS, k=self.rng.randint(shortest, longest))
+        return ' '.join(words).capitalize() + '.'
+
+    def progress(self, message):
+        return f'{message} ({time.monotonic() - self.started:.1f} с)'
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from news.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Заново строит полнотекстовый индекс новостей и комментариев.'
+
+    def handle(self, *args, **options):
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from news.cache import bump_news_versions
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики комментариев у всех новостей и сбрасывает '
+        'кеш тех, у которых они изменились.'
+    )
+
+    def handle(self, *args, **options):
+        before = self.comment_stats()
+        News.objects.refresh_comment_stats()
+        changed = [
+            pk for pk, stats in self.comment_stats().items()
+            if before.get(pk) != stats
+        ]
+        if changed:
+            # UPDATE идёт в обход сигналов, поэтому кеш сбрасывается здесь.
+            bump_news_versions(changed)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено новостей: {len(changed)}')
+        )
+
+    def comment_stats(self):
+        return {
+            pk: (count, last)
+            for pk, count, last in News.objects.values_list(
+                'pk', 'comment_count', 'last_comment_at'
+            ).iterator()
+        }
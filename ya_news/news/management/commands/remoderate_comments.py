@@ -0,0 +1,107 @@
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from news.forms import bad_words_filter
+from news.models import Comment
+
+
+def check_chunk(rows):
+    """
+    Проверяет порцию комментариев тем же фильтром, что и CommentForm.
+
+    Возвращает списки id, которые нужно отметить и с которых нужно
+    снять отметку.
+    """
+    to_flag, to_unflag = [], []
+    for pk, text, flagged in rows:
+        is_bad = bad_words_filter.search(text) is not None
+        if is_bad and not flagged:
+            to_flag.append(pk)
+        elif flagged and not is_bad:
+            to_unflag.append(pk)
+    return to_flag, to_unflag
+
+
+class Command(BaseCommand):
+    help = (
+        'Перепроверяет все комментарии на запрещённые слова и отмечает '
+        'найденные.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько комментариев читать и записывать за раз.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Число процессов проверки; 1 — проверять в текущем.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        workers = options['workers']
+        self.started = time.monotonic()
+        self.processed = self.flagged = self.unflagged = 0
+        if workers > 1:
+            with Pool(workers) as pool:
+                pending = deque()
+                for chunk in self.chunks(chunk_size):
+                    pending.append(
+                        (len(chunk), pool.apply_async(check_chunk, (chunk,)))
+                    )
+                    # Не читаем базу дальше, чем успевают проверять процессы.
+                    if len(pending) >= workers * 2:
+                        size, result = pending.popleft()
+                        self.save(size, *result.get())
+                while pending:
+                    size, result = pending.popleft()
+                    self.save(size, *result.get())
+        else:
+            for chunk in self.chunks(chunk_size):
+                self.save(len(chunk), *check_chunk(chunk))
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено: {self.processed}, отмечено: {self.flagged}, '
+            f'снято отметок: {self.unflagged}, '
+            f'{self.processed / max(elapsed, 1e-9):.0f} строк/с'
+        ))
+
+    def chunks(self, chunk_size):
+        """
+        Читает комментарии порциями по возрастанию id.
+
+        Каждая порция — отдельный запрос после последнего прочитанного id,
+        поэтому записи отметок не мешают чтению, а память не растёт.
+        """
+        last_pk = 0
+        while True:
+            chunk = list(
+                Comment.objects.filter(pk__gt=last_pk).order_by(
+                    'pk'
+                ).values_list('pk', 'text', 'flagged')[:chunk_size]
+            )
+            if not chunk:
+                return
+            last_pk = chunk[-1][0]
+            yield chunk
+
+    def save(self, size, to_flag, to_unflag):
+        with transaction.atomic():
+            if to_flag:
+                Comment.objects.filter(pk__in=to_flag).update(flagged=True)
+            if to_unflag:
+                Comment.objects.filter(pk__in=to_unflag).update(flagged=False)
+        self.processed += size
+        self.flagged += len(to_flag)
+        self.unflagged += len(to_unflag)
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            f'{self.processed} строк, '
+            f'{self.processed / max(elapsed, 1e-9):.0f} строк/с'
+        )
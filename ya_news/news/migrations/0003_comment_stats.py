@@ -0,0 +1,42 @@
+# Generated by Django 3.2.15 on 2026-10-18 02:37
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_stats(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    comments = Comment.objects.filter(
+        news=OuterRef('pk')
+    ).order_by().values('news')
+    News.objects.update(
+        comment_count=Coalesce(
+            Subquery(comments.annotate(count=Count('pk')).values('count')), 0
+        ),
+        last_comment_at=Subquery(
+            comments.annotate(last=Max('created')).values('last')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Комментариев'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Последний комментарий'),
+        ),
+        migrations.RunPython(fill_comment_stats, migrations.RunPython.noop),
+    ]
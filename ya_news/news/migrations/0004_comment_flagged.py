@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 02:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_comment_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='flagged',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Содержит запрещённые слова'),
+        ),
+    ]
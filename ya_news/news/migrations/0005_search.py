@@ -0,0 +1,103 @@
+from django.db import migrations
+
+# SQL скопирован из news.search на момент миграции: правки модуля не
+# должны менять уже применённую историю.
+CREATE_SEARCH_INDEX = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_news_fts USING fts5(
+        title, text,
+        content='news_news', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_news_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO news_news_fts(news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO news_news_fts(news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO news_news_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_comment_fts USING fts5(
+        text,
+        content='news_comment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_insert
+    AFTER INSERT ON news_comment BEGIN
+        INSERT INTO news_comment_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_delete
+    AFTER DELETE ON news_comment BEGIN
+        INSERT INTO news_comment_fts(news_comment_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_update
+    AFTER UPDATE OF text ON news_comment BEGIN
+        INSERT INTO news_comment_fts(news_comment_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO news_comment_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+)
+DROP_SEARCH_INDEX = (
+    'DROP TRIGGER IF EXISTS news_news_fts_insert',
+    'DROP TRIGGER IF EXISTS news_news_fts_delete',
+    'DROP TRIGGER IF EXISTS news_news_fts_update',
+    'DROP TRIGGER IF EXISTS news_comment_fts_insert',
+    'DROP TRIGGER IF EXISTS news_comment_fts_delete',
+    'DROP TRIGGER IF EXISTS news_comment_fts_update',
+    'DROP TABLE IF EXISTS news_news_fts',
+    'DROP TABLE IF EXISTS news_comment_fts',
+)
+REBUILD_SEARCH_INDEX = (
+    "INSERT INTO news_news_fts(news_news_fts) VALUES ('rebuild')",
+    "INSERT INTO news_comment_fts(news_comment_fts) VALUES ('rebuild')",
+)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_SEARCH_INDEX + REBUILD_SEARCH_INDEX:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SEARCH_INDEX:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_comment_flagged'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -2,15 +2,63 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def comment_count_subquery():
+    """Число комментариев к новости из внешнего запроса."""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(
+                news=OuterRef('pk')
+            ).order_by().values('news').annotate(
+                count=Count('pk')
+            ).values('count')
+        ),
+        0
+    )
+
+
+def last_comment_subquery():
+    """Время последнего комментария к новости из внешнего запроса."""
+    return Subquery(
+        Comment.objects.filter(
+            news=OuterRef('pk')
+        ).order_by().values('news').annotate(
+            last=Max('created')
+        ).values('last')
+    )
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def refresh_comment_stats(self):
+        """Пересчитывает счётчики комментариев одним запросом UPDATE."""
+        return self.update(
+            comment_count=comment_count_subquery(),
+            last_comment_at=last_comment_subquery(),
+        )
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(
+        'Комментариев', default=0, editable=False
+    )
+    last_comment_at = models.DateTimeField(
+        'Последний комментарий', null=True, blank=True, editable=False
+    )
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date',), name='news_date_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -29,9 +77,17 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    flagged = models.BooleanField(
+        'Содержит запрещённые слова', default=False, editable=False
+    )
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created'), name='comment_news_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+
+CURSOR_SEPARATOR = '_'
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+# Наибольшее целое, которое SQLite принимает как параметр запроса.
+MAX_INTEGER = 2 ** 63 - 1
+
+
+def encode_cursor(comment):
+    """Курсор указывает на последний показанный комментарий."""
+    timestamp = (comment.created - EPOCH) // MICROSECOND
+    return f'{timestamp}{CURSOR_SEPARATOR}{comment.pk}'
+
+
+def decode_cursor(cursor):
+    """
+    Разбирает курсор в пару (created, pk).
+
+    Для некорректного курсора выбрасывает ValueError.
+    """
+    timestamp, pk = cursor.split(CURSOR_SEPARATOR)
+    pk = int(pk)
+    if not 0 < pk <= MAX_INTEGER:
+        raise ValueError(f'Некорректный id в курсоре: {pk}')
+    try:
+        created = EPOCH + int(timestamp) * MICROSECOND
+    except OverflowError as error:
+        raise ValueError(
+            f'Некорректное время в курсоре: {timestamp}'
+        ) from error
+    return created, pk
+
+
+def paginate_comments(queryset, cursor, page_size):
+    """
+    Возвращает страницу комментариев после курсора и курсор следующей.
+
+    Комментарии упорядочены по (created, id), поэтому стоимость запроса
+    зависит только от размера страницы, а не от глубины прокрутки.
+    """
+    queryset = queryset.order_by('created', 'pk')
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created__gt=created) | Q(created=created, pk__gt=pk)
+        )
+    comments = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(comments) > page_size:
+        comments = comments[:page_size]
+        next_cursor = encode_cursor(comments[-1])
+    return comments, next_cursor
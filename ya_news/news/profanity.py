@@ -0,0 +1,117 @@
+import os
+from collections import deque
+
+# Короткий список быстрее проверить встроенным поиском подстроки.
+SMALL_WORD_LIST = 100
+
+
+class WordMatcher:
+    """
+    Автомат Ахо — Корасик для поиска любого из слов в тексте.
+
+    Строится один раз по списку слов, после чего проверяет текст за один
+    проход независимо от количества слов. Для короткого списка автомат
+    не строится: проверка подстрок в цикле в этом случае быстрее.
+    """
+
+    def __init__(self, words):
+        self.words = tuple(dict.fromkeys(
+            word for word in (word.strip().lower() for word in words) if word
+        ))
+        self.transitions = [{}]
+        self.fail = [0]
+        self.matches = [None]
+        if len(self.words) > SMALL_WORD_LIST:
+            for word in self.words:
+                self._add(word)
+            self._link()
+
+    def _add(self, word):
+        state = 0
+        for char in word:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.fail.append(0)
+                self.matches.append(None)
+                self.transitions[state][char] = next_state
+            state = next_state
+        if self.matches[state] is None:
+            self.matches[state] = word
+
+    def _link(self):
+        """Строит суффиксные ссылки обходом бора в ширину."""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.transitions[fail]:
+                    fail = self.fail[fail]
+                fail = self.transitions[fail].get(char, 0)
+                self.fail[next_state] = fail
+                if self.matches[next_state] is None:
+                    self.matches[next_state] = self.matches[fail]
+
+    def search(self, text):
+        """Первое найденное в тексте слово или None."""
+        text = text.lower()
+        if len(self.words) <= SMALL_WORD_LIST:
+            for word in self.words:
+                if word in text:
+                    return word
+            return None
+        transitions, fail, matches = self.transitions, self.fail, self.matches
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if matches[state] is not None:
+                return matches[state]
+        return None
+
+
+class BadWordsFilter:
+    """
+    Фильтр запрещённых слов.
+
+    К встроенному списку добавляются слова из файла, по одному на строку;
+    пустые строки и строки, начинающиеся с ``#``, пропускаются. Файл
+    перечитывается, как только меняется его время изменения или размер.
+    """
+
+    def __init__(self, words, path=None):
+        self.words = tuple(words)
+        self.path = path
+        self.file_state = None
+        self.matcher = WordMatcher(self.words)
+
+    def reload(self):
+        """Пересобирает автомат, если файл со словами изменился."""
+        if not self.path:
+            return
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            file_state = None
+        else:
+            file_state = (stat.st_mtime_ns, stat.st_size)
+        if file_state == self.file_state:
+            return
+        words = list(self.words)
+        if file_state is not None:
+            with open(self.path, encoding='utf-8') as file:
+                words.extend(
+                    line for line in file
+                    if line.strip() and not line.startswith('#')
+                )
+        self.matcher = WordMatcher(words)
+        self.file_state = file_state
+
+    def search(self, text):
+        """Первое найденное в тексте запрещённое слово или None."""
+        self.reload()
+        return self.matcher.search(text)
@@ -1,15 +1,59 @@
 import pytest
 
+from contextlib import contextmanager
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from news.models import News, Comment
+from .factories import make_comments, make_news
 
 
 User = get_user_model()
 
+SAVEPOINT_QUERIES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(db):
+    # С DatabaseCache из основных настроек кеш тоже лежит в базе.
+    cache.clear()
+
+
+@pytest.fixture
+def assert_num_data_queries():
+    """
+    Проверяет число запросов к данным внутри блока.
+
+    Запросы к таблице DatabaseCache и точки сохранения, которыми он
+    оборачивает запись, не считаются: с основными настройками каждое
+    обращение к кешу — тоже запрос к базе.
+    """
+    @contextmanager
+    def check(num):
+        table = None
+        if settings.CACHES['default']['BACKEND'].endswith('.DatabaseCache'):
+            table = connection.ops.quote_name(
+                settings.CACHES['default']['LOCATION']
+            )
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(SAVEPOINT_QUERIES)
+            and (table is None or table not in query['sql'])
+        ]
+        assert len(queries) == num, (
+            f'Ожидалось запросов: {num}, выполнено: {len(queries)}\n'
+            + '\n'.join(queries)
+        )
+
+    return check
+
 
 @pytest.fixture
 def author(django_user_model):
@@ -47,16 +91,12 @@ def form_data():
 @pytest.fixture
 def news_list(db):
     today = timezone.now()
-    all_news = [
-        News(
-            title=f'Новость {index}',
-            text='Текст.',
-            date=today - timedelta(days=index)
-        )
-        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
-    ]
-    News.objects.bulk_create(all_news)
-    return all_news
+    return make_news(
+        settings.NEWS_COUNT_ON_HOME_PAGE + 1,
+        title=lambda index: f'Новость {index}',
+        text='Текст.',
+        date=lambda index: today - timedelta(days=index),
+    )
 
 
 @pytest.fixture
@@ -65,13 +105,7 @@ def news_with_comments(author_client):
     news = News.objects.create(
         title='Тестовая новость', text='Просто текст.'
     )
-    now = timezone.now()
-    comments = []
-    for index in range(2):
-        comment = Comment.objects.create(
-            news=news, author=author, text=f'Tекст {index}',
-        )
-        comment.created = now + timedelta(days=index)
-        comment.save()
-        comments.append(comment)
+    comments = make_comments(
+        news, author, [f'Tекст {index}' for index in range(2)]
+    )
     return news, comments
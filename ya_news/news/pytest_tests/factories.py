@@ -0,0 +1,41 @@
+"""Фабрики тестовых данных: строки создаются пачками, а не по одной."""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from news.models import Comment, News
+
+
+def make_news(count, **fields):
+    """
+    Создаёт ``count`` новостей одним запросом.
+
+    Поля могут быть функциями от номера новости.
+    """
+    return News.objects.bulk_create(
+        News(**{
+            name: value(index) if callable(value) else value
+            for name, value in fields.items()
+        })
+        for index in range(count)
+    )
+
+
+def make_comments(news, author, texts, step=timedelta(days=1)):
+    """
+    Создаёт комментарии к новости с датами через ``step``.
+
+    Поле ``created`` заполняется при вставке, поэтому даты проставляются
+    вторым запросом. Счётчики новости пересчитываются, как это сделали
+    бы сигналы. Всего четыре запроса на любое число комментариев.
+    """
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=text) for text in texts
+    )
+    comments = list(news.comment_set.order_by('-pk')[:len(texts)])[::-1]
+    now = timezone.now()
+    for index, comment in enumerate(comments):
+        comment.created = now + step * index
+    Comment.objects.bulk_update(comments, ['created'])
+    News.objects.filter(pk=news.pk).refresh_comment_stats()
+    return comments
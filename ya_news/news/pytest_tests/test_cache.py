@@ -0,0 +1,39 @@
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.test import override_settings
+
+from news.cache import (
+    NEWS_VERSION_KEY,
+    PAGE_LOCK_KEY,
+    bump_news_version,
+    get_news_version,
+)
+from yanews import settings as project_settings
+from yanews.cache import create_cache_table
+
+pytestmark = pytest.mark.django_db
+
+
+def test_cache_versions_are_shared_between_workers(news):
+    """Версию, сменённую одним воркером, видят кеши остальных."""
+    location = project_settings.CACHES['default']['LOCATION']
+    with override_settings(CACHES=project_settings.CACHES):
+        create_cache_table(sender=None, using='default')
+        other_worker = DatabaseCache(location, {})
+        key = NEWS_VERSION_KEY.format(pk=news.pk)
+        version = get_news_version(news.pk)
+        assert other_worker.get(key) == version
+        bump_news_version(news.pk)
+        assert other_worker.get(key) not in (None, version)
+
+
+def test_page_lock_is_shared_between_workers(news):
+    """Пока один воркер перерисовывает страницу, другой её не трогает."""
+    location = project_settings.CACHES['default']['LOCATION']
+    with override_settings(CACHES=project_settings.CACHES):
+        create_cache_table(sender=None, using='default')
+        other_worker = DatabaseCache(location, {})
+        lock_key = PAGE_LOCK_KEY.format(digest='page')
+        assert cache.add(lock_key, True, 10)
+        assert not other_worker.add(lock_key, True, 10)
@@ -0,0 +1,96 @@
+import pytest
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from news.forms import BAD_WORDS
+from news.models import Comment, News
+from news.search import search_news
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recount_comments_command(news, comment):
+    """Команда recount_comments восстанавливает счётчики."""
+    News.objects.update(comment_count=0, last_comment_at=None)
+    call_command('recount_comments', stdout=StringIO())
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    assert news.last_comment_at == comment.created
+
+
+def test_recount_comments_resets_cache(client, author, news):
+    """После пересчёта счётчиков страницы не отдаются из кеша и 304."""
+    url = reverse('news:home')
+    etag = client.get(url)['ETag']
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(3)
+    )
+    out = StringIO()
+    call_command('recount_comments', stdout=out)
+    assert 'Обновлено новостей: 1' in out.getvalue()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_remoderate_comments_command(author, news, comment, workers):
+    """Команда remoderate_comments отмечает комментарии с бранью."""
+    bad_comment = Comment.objects.create(
+        news=news, author=author, text=f'Ты {BAD_WORDS[0]}!'
+    )
+    Comment.objects.filter(pk=comment.pk).update(flagged=True)
+    call_command(
+        'remoderate_comments',
+        chunk_size=1,
+        workers=workers,
+        stdout=StringIO(),
+    )
+    assert list(
+        Comment.objects.filter(flagged=True).values_list('pk', flat=True)
+    ) == [bad_comment.pk]
+
+
+def test_export_news_command(news, comment):
+    out, err = StringIO(), StringIO()
+    call_command('export_news', format='jsonl', stdout=out, stderr=err)
+    assert comment.text in out.getvalue()
+    assert 'Выгружено 1 строк' in err.getvalue()
+
+
+def test_generate_news_command(client):
+    def snapshot():
+        return list(
+            News.objects.order_by('pk').values_list('title', 'comment_count')
+        )
+
+    etag = client.get(reverse('news:home'))['ETag']
+    options = {'news': 20, 'users': 5, 'comments': 300, 'seed': 1}
+    call_command('generate_news', stdout=StringIO(), **options)
+    response = client.get(reverse('news:home'), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, \
+        'После загрузки главная не должна отдаваться из кеша.'
+    first = snapshot()
+    assert sum(count for _, count in first) == 300
+    assert max(count for _, count in first) > 300 / 20 * 2, \
+        'Комментарии должны распределяться неравномерно.'
+    assert search_news(first[0][0].split()[0], 1, 1)[0]
+    times = list(Comment.objects.values_list('created', 'news__date'))
+    assert len({created for created, _ in times}) > 1, \
+        'Время комментариев должно различаться.'
+    assert all(
+        timezone.localtime(created).date() >= published
+        for created, published in times
+    ), 'Комментарий не может быть раньше новости.'
+    News.objects.all().delete()
+    User.objects.all().delete()
+    call_command('generate_news', stdout=StringIO(), **options)
+    assert snapshot() == first
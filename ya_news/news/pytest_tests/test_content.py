@@ -1,9 +1,22 @@
+import csv
+import hashlib
+import json
+import logging
+from http import HTTPStatus
+from io import StringIO
+
 import pytest
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
+from news.cache import PAGE_LOCK_KEY, bump_news_version
 from news.forms import CommentForm
+from news.models import Comment, News
 
 User = get_user_model()
 
@@ -66,3 +79,279 @@ def test_authorized_client_has_comment_form(author_client, news):
     form = response.context['form']
     assert isinstance(form, CommentForm), \
         "Форма в контексте не является экземпляром CommentForm."
+
+
+def test_home_page_comment_count(
+        author_client, assert_num_data_queries, news_with_comments
+):
+    """Число комментариев на главной считается одним запросом."""
+    news, comments = news_with_comments
+    # Сессия, пользователь и список новостей вместе с числом комментариев.
+    with assert_num_data_queries(3):
+        response = author_client.get(reverse('news:home'))
+    object_list = response.context['object_list']
+    assert object_list[0].comment_count == len(comments), \
+        "Число комментариев к новости посчитано неверно."
+
+
+def test_comments_keyset_pagination(client, news_with_comments, settings):
+    """Комментарии выводятся порциями по курсору."""
+    settings.COMMENTS_COUNT_ON_NEWS_PAGE = 1
+    news, comments = news_with_comments
+    url = reverse('news:detail', args=(news.id,))
+    response = client.get(url)
+    assert [item.pk for item in response.context['comments']] == [
+        comments[0].pk
+    ]
+    next_cursor = response.context['next_cursor']
+    assert next_cursor is not None, \
+        "Не сформирован курсор для следующей порции комментариев."
+    response = client.get(url, {'after': next_cursor})
+    assert [item.pk for item in response.context['comments']] == [
+        comments[1].pk
+    ]
+    assert response.context['next_cursor'] is None
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    ('not-a-cursor', '99999999999999999999_1', '1_99999999999999999999'),
+)
+def test_comments_invalid_cursor(client, news, cursor):
+    """Некорректный курсор комментариев приводит к ошибке 404."""
+    url = reverse('news:detail', args=(news.id,))
+    response = client.get(url, {'after': cursor})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_comment_block_is_cached(
+        client, author_client, news_with_comments, form_data
+):
+    """Блок комментариев берётся из кеша до изменения комментариев."""
+    news, comments = news_with_comments
+    url = reverse('news:detail', args=(news.id,))
+    client.get(url)
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    assert not any(
+        'news_comment' in query['sql'] for query in context.captured_queries
+    ), "Повторный запрос страницы снова читает комментарии из базы."
+    author_client.post(url, data=form_data)
+    response = client.get(url)
+    assert len(response.context['comments']) == len(comments) + 1, \
+        "Новый комментарий не появился на странице новости."
+
+
+def test_anonymous_page_is_cached(client, assert_num_data_queries, news):
+    """Анонимный пользователь получает страницу из кеша."""
+    url = reverse('news:home')
+    client.get(url)
+    with assert_num_data_queries(0):
+        response = client.get(url)
+    assert news.title in response.content.decode()
+    News.objects.create(title='Свежая новость', text='Текст')
+    response = client.get(url)
+    assert 'Свежая новость' in response.content.decode(), \
+        "Кеш страницы не сброшен после добавления новости."
+
+
+def test_stale_page_served_during_regeneration(client, news):
+    """Пока страница перерисовывается, остальным отдаётся старая копия."""
+    url = reverse('news:detail', args=(news.id,))
+    client.get(url)
+    lock_key = PAGE_LOCK_KEY.format(
+        digest=hashlib.md5(url.encode()).hexdigest()
+    )
+    cache.add(lock_key, True)
+    News.objects.filter(pk=news.pk).update(title='Новый заголовок')
+    bump_news_version(news.pk)
+    response = client.get(url)
+    assert news.title in response.content.decode(), \
+        "Во время перерисовки страницы не отдана устаревшая копия."
+    cache.delete(lock_key)
+    response = client.get(url)
+    assert 'Новый заголовок' in response.content.decode()
+
+
+def test_expired_page_served_while_lock_is_held(
+        client, assert_num_data_queries, news, settings
+):
+    """Истёкшую страницу перерисовывает только владелец блокировки."""
+    settings.PAGE_CACHE_TIMEOUT = 0
+    url = reverse('news:home')
+    client.get(url)
+    lock_key = PAGE_LOCK_KEY.format(
+        digest=hashlib.md5(url.encode()).hexdigest()
+    )
+    assert cache.add(lock_key, True)
+    # Обновление в обход сигналов: версия та же, копия только истекла.
+    News.objects.filter(pk=news.pk).update(title='Новый заголовок')
+    with assert_num_data_queries(0):
+        response = client.get(url)
+    assert news.title in response.content.decode(), \
+        "Пока блокировка занята, истёкшая страница перерисовывается."
+    cache.delete(lock_key)
+    response = client.get(url)
+    assert 'Новый заголовок' in response.content.decode()
+
+
+@pytest.mark.parametrize('name', ('news:home', 'news:detail'))
+def test_conditional_get(client, news, name):
+    """Неизменённая страница отдаётся ответом 304 без тела."""
+    args = (news.id,) if name == 'news:detail' else None
+    url = reverse(name, args=args)
+    response = client.get(url)
+    etag = response['ETag']
+    assert not response.has_header('Last-Modified')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    News.objects.filter(pk=news.pk).update(title='Новый заголовок')
+    bump_news_version(news.pk)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_stale_page_keeps_its_etag(client, news):
+    """Устаревшая копия отдаётся со своим ETag, а не с ETag новой версии."""
+    url = reverse('news:detail', args=(news.id,))
+    etag = client.get(url)['ETag']
+    lock_key = PAGE_LOCK_KEY.format(
+        digest=hashlib.md5(url.encode()).hexdigest()
+    )
+    cache.add(lock_key, True)
+    News.objects.filter(pk=news.pk).update(title='Новый заголовок')
+    bump_news_version(news.pk)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, \
+        "Пока страница перерисовывается, её копия не изменилась."
+    stale = client.get(url)
+    assert stale['ETag'] == etag
+    cache.delete(lock_key)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Новый заголовок' in response.content.decode()
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize('action', ('news:edit', 'news:delete'))
+def test_etag_changes_with_comments(author_client, comment, form_data, action):
+    """После правки или удаления комментария страница не отдаётся 304."""
+    url = reverse('news:detail', args=(comment.news.id,))
+    anonymous = Client()
+    etag = anonymous.get(url)['ETag']
+    author_client.post(reverse(action, args=(comment.id,)), data=form_data)
+    response = anonymous.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_search_highlights_news_and_comments(client, author, news):
+    """Поиск находит новости и комментарии и выделяет совпадения."""
+    news.title = 'Запуск <ракеты>'
+    news.save()
+    Comment.objects.create(
+        news=news, author=author, text='Ракета улетела, ракеты летают!'
+    )
+    response = client.get(reverse('news:search'), {'q': 'ракет'})
+    found_news = response.context['news_list']
+    assert [item.pk for item in found_news] == [news.pk]
+    assert found_news[0].title_match == 'Запуск &lt;<mark>ракеты</mark>&gt;'
+    found_comments = response.context['comment_list']
+    assert '<mark>Ракета</mark>' in found_comments[0].text_match
+    assert not response.context['has_next']
+
+
+def test_search_pages(client, author, news, settings):
+    """Результаты поиска разбиты на страницы."""
+    settings.NEWS_COUNT_ON_SEARCH_PAGE = 1
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(2)
+    )
+    url = reverse('news:search')
+    response = client.get(url, {'q': 'комментарий'})
+    assert response.context['has_next']
+    response = client.get(url, {'q': 'комментарий', 'page': 2})
+    assert len(response.context['comment_list']) == 1
+    assert not response.context['has_next']
+
+
+@pytest.mark.parametrize(
+    'page',
+    ('0', 'abc', str(settings.SEARCH_MAX_PAGE + 1), '99999999999999999999'),
+)
+def test_search_invalid_page(client, news, page):
+    """Номер страницы вне допустимых приводит к ошибке 404."""
+    response = client.get(reverse('news:search'), {'q': 'текст', 'page': page})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_export_streams_news_with_comments(admin_client, news_with_comments):
+    """Выгрузка идёт потоком, комментарии следуют за своей новостью."""
+    empty_news = News.objects.create(title='Без комментариев', text='Текст')
+    url = reverse('news:export')
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url, {'format': 'csv'})
+        assert response.streaming
+        content = b''.join(response.streaming_content).decode()
+    assert len(queries) <= 4, 'Выгрузка не должна делать запрос на строку.'
+    rows = list(csv.DictReader(content.splitlines()))
+    assert [row['comment_text'] for row in rows] == [
+        'Tекст 0', 'Tекст 1', ''
+    ]
+    news, _ = news_with_comments
+    assert rows[0]['news_id'] == str(news.pk)
+    assert rows[-1]['news_id'] == str(empty_news.pk)
+    response = admin_client.get(url, {'format': 'jsonl'})
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)['comment_id'] for line in lines] == list(
+        Comment.objects.order_by('created').values_list('pk', flat=True)
+    ) + [None]
+    assert admin_client.get(url, {'format': 'xml'}).status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+@pytest.mark.parametrize('name', ('news:feed', 'news:atom'))
+def test_feed_is_cached_until_comments_change(
+        client, assert_num_data_queries, author, news, name
+):
+    """Лента берётся из кеша и перестраивается после нового комментария."""
+    url = reverse(name)
+    response = client.get(url)
+    assert news.title in response.content.decode()
+    assert '<slash:comments>0</slash:comments>' in response.content.decode()
+    # Лента должна отдаваться из кеша.
+    with assert_num_data_queries(0):
+        cached = client.get(url)
+    assert cached.content == response.content
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    Comment.objects.create(news=news, author=author, text='Комментарий')
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.OK
+    assert '<slash:comments>1</slash:comments>' in response.content.decode()
+
+
+def test_server_timing_header(client, news, caplog, settings):
+    """Ответ несёт Server-Timing, превышение бюджета попадает в лог."""
+    settings.QUERY_BUDGET = 0
+    with caplog.at_level('INFO', logger='yanews.middleware'):
+        response = client.get(reverse('news:detail', args=(news.pk,)))
+    timing = response['Server-Timing']
+    for metric in ('db;dur=', 'view;dur=', 'tpl;dur=', 'total;dur='):
+        assert metric in timing
+    record, = caplog.records
+    assert record.levelname == 'WARNING'
+    assert '"view": "news:detail"' in record.getMessage()
+
+
+def test_request_log_has_handler(client, news):
+    """Строка о запросе с уровнем INFO выводится обработчиком из LOGGING."""
+    handler, = logging.getLogger('yanews').handlers
+    stream = StringIO()
+    previous = handler.setStream(stream)
+    try:
+        client.get(reverse('news:detail', args=(news.pk,)))
+    finally:
+        handler.setStream(previous)
+    assert 'INFO yanews.middleware request' in stream.getvalue()
@@ -2,11 +2,15 @@ import pytest
 from http import HTTPStatus
 
 from pytest_django.asserts import assertRedirects, assertFormError
+from django.contrib.auth import get_user_model
 from django.urls import reverse
 
-from news.models import Comment
+from news.models import Comment, News
+from news.profanity import SMALL_WORD_LIST, BadWordsFilter, WordMatcher
 from news.forms import BAD_WORDS, WARNING
 
+User = get_user_model()
+
 pytestmark = pytest.mark.django_db
 
 
@@ -105,3 +109,85 @@ def test_other_user_cant_delete_news(admin_client, comment):
     response = admin_client.delete(delete_url)
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert Comment.objects.count() == comments_count_before
+
+
+def test_comment_stats_follow_comments(author_client, news, form_data):
+    """Счётчики комментариев у новости обновляются при записи."""
+    url = reverse('news:detail', args=(news.id,))
+    author_client.post(url, data=form_data)
+    news.refresh_from_db()
+    comment = Comment.objects.get(news=news)
+    assert news.comment_count == 1
+    assert news.last_comment_at == comment.created
+    author_client.post(reverse('news:delete', args=(comment.id,)))
+    news.refresh_from_db()
+    assert news.comment_count == 0
+    assert news.last_comment_at is None
+
+
+def test_repeated_comment_delete_keeps_count(author, news, comment):
+    """Повторное удаление комментария не уводит счётчик ниже нуля."""
+    other = Comment.objects.create(news=news, author=author, text='Ещё')
+    deleted = Comment.objects.get(pk=comment.pk)
+    comment.delete()
+    deleted.delete()
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    assert news.last_comment_at == other.created
+
+
+def test_delete_with_drifted_count(author_client, news, comment):
+    """Удаление комментария исправляет сбившийся счётчик."""
+    News.objects.filter(pk=news.pk).update(comment_count=0)
+    response = author_client.post(reverse('news:delete', args=(comment.pk,)))
+    assert response.status_code == HTTPStatus.FOUND
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+def test_news_delete_skips_comment_counters(
+        author, news, assert_num_data_queries
+):
+    """Удаление новости не пересчитывает её счётчики по комментарию."""
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {index}')
+        for index in range(50)
+    )
+    # Комментарии выбираются и удаляются пачкой, затем сама новость.
+    with assert_num_data_queries(3):
+        news.delete()
+    assert not Comment.objects.exists()
+
+
+def test_bad_words_file_is_reloaded(tmp_path):
+    """Слова из файла подхватываются после его изменения."""
+    path = tmp_path / 'bad_words.txt'
+    bad_words = BadWordsFilter(BAD_WORDS, path)
+    assert bad_words.search('Просто грубиян') is None
+    path.write_text('# Модерация\nгрубиян\n', encoding='utf-8')
+    assert bad_words.search('Просто ГРУБИЯН') == 'грубиян'
+    assert bad_words.search(f'Ты {BAD_WORDS[0]}!') == BAD_WORDS[0]
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    (
+        ('Скотина', 'скот'),
+        ('котёл', 'кот'),
+        ('КОТЁЛ', 'кот'),
+        ('скокот', 'кот'),
+        ('с кот', 'кот'),
+        ('ско т', None),
+        ('молоток', None),
+    ),
+)
+def test_word_matcher_automaton(text, expected):
+    """Автомат для длинного списка находит пересекающиеся слова."""
+    words = [f'слово{index}' for index in range(SMALL_WORD_LIST)]
+    words += ['кот', 'скот', 'котёл']
+    matcher = WordMatcher(words)
+    assert len(matcher.transitions) > 1, "Автомат не построен."
+    assert matcher.search(text) == expected
+    assert (expected is None) == all(
+        word not in text.lower() for word in words
+    )
@@ -0,0 +1,102 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from news.models import Comment, News
+from news.urls import urlpatterns
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+SIZES = (1, 10, 1000)
+
+URLS = {
+    'home': lambda news, comment: reverse('news:home'),
+    'detail': lambda news, comment: reverse('news:detail', args=(news.pk,)),
+    'search': lambda news, comment: reverse('news:search'),
+    'export': lambda news, comment: reverse('news:export'),
+    'feed': lambda news, comment: reverse('news:feed'),
+    'atom': lambda news, comment: reverse('news:atom'),
+    'edit': lambda news, comment: reverse('news:edit', args=(comment.pk,)),
+    'delete': lambda news, comment: reverse(
+        'news:delete', args=(comment.pk,)
+    ),
+}
+PARAMS = {'search': {'q': 'текст'}}
+
+
+def grow_data(author, size):
+    """
+    Доводит число новостей и комментариев к первой из них до ``size``.
+
+    У каждой новости есть хотя бы один комментарий, чтобы запросы
+    на новость в списках тоже были заметны.
+    """
+    News.objects.bulk_create(
+        News(title=f'Новость {index}', text='Текст новости')
+        for index in range(News.objects.count(), size)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Текст')
+        for news in News.objects.filter(comment__isnull=True)
+    )
+    first = News.objects.order_by('pk').first()
+    Comment.objects.bulk_create(
+        Comment(news=first, author=author, text=f'Текст {index}')
+        for index in range(first.comment_set.count(), size)
+    )
+    News.objects.refresh_comment_stats()
+    return first
+
+
+def test_every_url_is_covered():
+    """Каждый адрес из news.urls проверяется на число запросов."""
+    assert {pattern.name for pattern in urlpatterns} == set(URLS)
+
+
+@pytest.fixture(scope='module')
+def query_counts(django_db_setup, django_db_blocker):
+    """
+    Число запросов каждой страницы при каждом размере данных.
+
+    Данные растут один раз на весь модуль, а не заново для каждой
+    страницы, и откатываются после замеров.
+    """
+    counts = {name: {} for name in URLS}
+    urls = {}
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            author = User.objects.create(username='Автор', is_staff=True)
+            client = Client()
+            client.force_login(author)
+            for size in SIZES:
+                news = grow_data(author, size)
+                comment = Comment.objects.first()
+                for name, build_url in URLS.items():
+                    cache.clear()
+                    urls[name] = build_url(news, comment)
+                    with CaptureQueriesContext(connection) as queries:
+                        response = client.get(urls[name], PARAMS.get(name))
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    counts[name][size] = len(queries)
+            transaction.set_rollback(True)
+        cache.clear()
+    return {
+        name: (resolve(urls[name])._func_path, counts[name])
+        for name in URLS
+    }
+
+
+@pytest.mark.parametrize('name', URLS)
+def test_query_count_does_not_grow(query_counts, name):
+    """Число запросов страницы не зависит от числа новостей и комментариев."""
+    view, counts = query_counts[name]
+    assert len(set(counts.values())) == 1, (
+        f'Число запросов {view} ({name}) растёт вместе с данными: {counts}'
+    )
@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+def explain(sql):
+    """План выполнения запроса SQLite в виде списка строк."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_plans_use_indexes(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    selects = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+    ]
+    assert selects, f'Страница {url} не выполнила ни одного запроса.'
+    for sql in selects:
+        for step in explain(sql):
+            assert 'TEMP B-TREE' not in step, \
+                f'Запрос сортируется без индекса ({step}): {sql}'
+            assert not (step.startswith('SCAN') and 'USING' not in step), \
+                f'Запрос читает всю таблицу ({step}): {sql}'
+
+
+def test_anonymous_pages_use_indexes(client, comment):
+    """Запросы публичных страниц не сканируют таблицы целиком."""
+    assert_plans_use_indexes(client, reverse('news:home'))
+    assert_plans_use_indexes(
+        client, reverse('news:detail', args=(comment.news.pk,))
+    )
+
+
+@pytest.mark.parametrize(
+    'name',
+    ('news:detail', 'news:edit', 'news:delete'),
+)
+def test_author_pages_use_indexes(author_client, comment, name):
+    """Запросы страниц автора не сканируют таблицы целиком."""
+    pk = comment.news.pk if name == 'news:detail' else comment.pk
+    assert_plans_use_indexes(author_client, reverse(name, args=(pk,)))
@@ -0,0 +1,100 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from news.models import Comment, News
+from yanews.routers import ReplicaRouter, replica_reads
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(tmp_path, settings, news):
+    """
+    Реплика в отдельном файле SQLite, отставшая от основной базы.
+
+    В неё попадает только новость из фикстуры ``news``: всё, что тест
+    запишет дальше, реплика не увидит.
+    """
+    connections.settings[REPLICA] = {
+        **connections.settings['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    with connections[REPLICA].schema_editor() as editor:
+        for model in (User, News, Comment):
+            editor.create_model(model)
+    News.objects.using(REPLICA).bulk_create([news])
+    settings.DATABASE_REPLICAS = [REPLICA]
+    yield
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def test_reads_go_to_replica(author_client, replica):
+    """Новость, которой ещё нет на реплике, на реплике не найти."""
+    fresh = News.objects.create(title='Свежая новость', text='Текст')
+    url = reverse('news:detail', args=(fresh.pk,))
+    assert author_client.get(url).status_code == 404
+    author_client.cookies[settings.REPLICA_PIN_COOKIE] = '1'
+    assert author_client.get(url).status_code == 200
+
+
+def test_cached_pages_are_filled_from_primary(
+        author_client, news, form_data, replica
+):
+    """Кеш под новой версией новости заполняется из основной базы."""
+    url = reverse('news:detail', args=(news.pk,))
+    response = author_client.post(url, data=form_data)
+    assert settings.REPLICA_PIN_COOKIE in response.cookies
+    assert not Comment.objects.using(REPLICA).exists()
+    assert form_data['text'] in Client().get(url).content.decode()
+    assert form_data['text'] in author_client.get(url).content.decode()
+    # Без привязки новость читается с реплики, а комментарии — из кеша.
+    del author_client.cookies[settings.REPLICA_PIN_COOKIE]
+    assert form_data['text'] in author_client.get(url).content.decode()
+
+
+def test_anonymous_pages_read_from_replica(news, replica, settings):
+    """Страницы для анонимов строятся по реплике, когда она догнала запись."""
+    # Реплика считается догнавшей основную базу сразу после записи.
+    settings.REPLICA_PIN_SECONDS = 0
+    fresh = News.objects.create(title='Свежая новость', text='Текст')
+    client = Client()
+    for url in (
+        reverse('news:home'), reverse('news:detail', args=(news.pk,))
+    ):
+        with CaptureQueriesContext(connection) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert fresh.title not in response.content.decode()
+        assert any(
+            'news_news' in query['sql']
+            for query in replica_queries.captured_queries
+        )
+        assert not any(
+            table in query['sql']
+            for query in primary.captured_queries
+            for table in ('news_news', 'news_comment')
+        ), 'Данные страницы для анонима прочитаны из основной базы.'
+
+
+def test_one_replica_per_block(settings):
+    """Внутри одного блока все чтения идут на одну и ту же реплику."""
+    settings.DATABASE_REPLICAS = ['first', 'second', 'third']
+    router = ReplicaRouter()
+    for _ in range(20):
+        with replica_reads():
+            aliases = {router.db_for_read(News) for _ in range(20)}
+        assert len(aliases) == 1
+        assert aliases <= set(settings.DATABASE_REPLICAS)
+    assert router.db_for_read(News) == 'default'
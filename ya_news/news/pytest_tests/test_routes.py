@@ -9,7 +9,15 @@ pytestmark = pytest.mark.django_db
 
 @pytest.mark.parametrize(
     'name',
-    ('news:home', 'users:login', 'users:logout', 'users:signup')
+    (
+        'news:home',
+        'news:search',
+        'news:feed',
+        'news:atom',
+        'users:login',
+        'users:logout',
+        'users:signup',
+    )
 )
 def test_pages_availability_for_anonymous_user(client, name):
     """Страницы доступны анонимным пользователям."""
@@ -61,3 +69,16 @@ def test_redirect_for_edit_comments(client, comment):
     expected_url = f'{login_url}?next={url}'
     response = client.get(url)
     assertRedirects(response, expected_url)
+
+
+@pytest.mark.parametrize(
+    'parametrized_client, expected_status',
+    (
+        (pytest.lazy_fixture('admin_client'), HTTPStatus.OK),
+        (pytest.lazy_fixture('author_client'), HTTPStatus.FORBIDDEN)
+    ),
+)
+def test_export_availability(parametrized_client, expected_status):
+    """Выгрузка новостей доступна только сотрудникам."""
+    response = parametrized_client.get(reverse('news:export'))
+    assert response.status_code == expected_status
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from yanews.sqlite import check_connections
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Отдельное соединение с файлом SQLite, как у рабочего сервера."""
+    database = DatabaseWrapper({
+        **connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')
+    })
+    yield database
+    database.close()
+
+
+def test_sqlite_pragmas_are_applied(database):
+    """Настройки SQLITE_PRAGMAS применяются к новому соединению."""
+    with database.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        assert cursor.fetchone()[0] == 'wal'
+        cursor.execute('PRAGMA busy_timeout')
+        assert cursor.fetchone()[0] == settings.SQLITE_PRAGMAS[
+            'busy_timeout'
+        ]
+
+
+def test_broken_connection_is_closed_before_request(database, monkeypatch):
+    """Сломанное постоянное соединение закрывается, рабочее остаётся."""
+    monkeypatch.setattr(
+        'yanews.sqlite.connections', SimpleNamespace(all=lambda: [database])
+    )
+    database.ensure_connection()
+    check_connections()
+    assert database.connection is not None
+    database.connection.close()
+    check_connections()
+    assert database.connection is None
@@ -0,0 +1,47 @@
+import logging
+from io import StringIO
+
+import pytest
+from django.db import connections
+from django.template import engines
+
+from yanews.warmup import warm_up
+
+pytestmark = pytest.mark.django_db
+
+
+def test_warm_up_compiles_templates(caplog):
+    """Прогрев кладёт шаблоны в кеширующий загрузчик и пишет время."""
+    loader = engines['django'].engine.template_loaders[0]
+    loader.reset()
+    with caplog.at_level(logging.INFO, logger='yanews.warmup'):
+        warm_up()
+    assert 'news/detail.html' in loader.get_template_cache
+    assert 'Прогрев занял' in caplog.text
+
+
+def test_warm_up_time_has_handler():
+    """Время прогрева выводится обработчиком из LOGGING."""
+    handler, = logging.getLogger('yanews').handlers
+    stream = StringIO()
+    previous = handler.setStream(stream)
+    try:
+        warm_up()
+    finally:
+        handler.setStream(previous)
+    assert 'INFO yanews.warmup Прогрев занял' in stream.getvalue()
+
+
+def test_warm_up_closes_connections(tmp_path):
+    """После прогрева у процесса не остаётся открытых соединений."""
+    connections.settings['warmup'] = {
+        **connections.settings['default'],
+        'NAME': str(tmp_path / 'warmup.sqlite3'),
+    }
+    try:
+        connections['warmup'].ensure_connection()
+        warm_up()
+        assert connections['warmup'].connection is None
+    finally:
+        del connections['warmup']
+        del connections.settings['warmup']
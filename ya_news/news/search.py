@@ -0,0 +1,209 @@
+import re
+
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Comment, News
+
+NEWS_TABLE = 'news_news_fts'
+COMMENT_TABLE = 'news_comment_fts'
+# Служебные символы вокруг совпадений, которые заменяются на <mark>
+# уже после экранирования текста.
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+SNIPPET_TOKENS = 24
+
+CREATE_SEARCH_INDEX = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {NEWS_TABLE} USING fts5(
+        title, text,
+        content='news_news', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {NEWS_TABLE}_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO {NEWS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {NEWS_TABLE}_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO {NEWS_TABLE}({NEWS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {NEWS_TABLE}_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO {NEWS_TABLE}({NEWS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {NEWS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {COMMENT_TABLE} USING fts5(
+        text,
+        content='news_comment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {COMMENT_TABLE}_insert
+    AFTER INSERT ON news_comment BEGIN
+        INSERT INTO {COMMENT_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {COMMENT_TABLE}_delete
+    AFTER DELETE ON news_comment BEGIN
+        INSERT INTO {COMMENT_TABLE}({COMMENT_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {COMMENT_TABLE}_update
+    AFTER UPDATE OF text ON news_comment BEGIN
+        INSERT INTO {COMMENT_TABLE}({COMMENT_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {COMMENT_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+)
+REBUILD_SEARCH_INDEX = tuple(
+    f"INSERT INTO {table}({table}) VALUES ('rebuild')"
+    for table in (NEWS_TABLE, COMMENT_TABLE)
+)
+OPTIMIZE_SEARCH_INDEX = tuple(
+    f"INSERT INTO {table}({table}) VALUES ('optimize')"
+    for table in (NEWS_TABLE, COMMENT_TABLE)
+)
+
+SEARCH_NEWS = f"""
+    SELECT news_news.id, news_news.title, news_news.date,
+        highlight({NEWS_TABLE}, 0, %s, %s) AS title_match,
+        snippet(
+            {NEWS_TABLE}, 1, %s, %s, '…', {SNIPPET_TOKENS}
+        ) AS text_match
+    FROM {NEWS_TABLE}
+    JOIN news_news ON news_news.id = {NEWS_TABLE}.rowid
+    WHERE {NEWS_TABLE} MATCH %s
+    ORDER BY rank
+    LIMIT %s OFFSET %s
+"""
+SEARCH_COMMENTS = f"""
+    SELECT news_comment.id, news_comment.news_id, news_comment.created,
+        news_news.title AS news_title,
+        snippet(
+            {COMMENT_TABLE}, 0, %s, %s, '…', {SNIPPET_TOKENS}
+        ) AS text_match
+    FROM {COMMENT_TABLE}
+    JOIN news_comment ON news_comment.id = {COMMENT_TABLE}.rowid
+    JOIN news_news ON news_news.id = news_comment.news_id
+    WHERE {COMMENT_TABLE} MATCH %s
+    ORDER BY rank
+    LIMIT %s OFFSET %s
+"""
+
+
+def match_expression(query):
+    """
+    Превращает пользовательский запрос в выражение FTS5.
+
+    Каждое слово берётся в кавычки, чтобы операторы FTS5 в запросе не
+    ломали синтаксис, и ищется как префикс. Слова объединяются через И.
+    """
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def highlight(fragment):
+    """Экранирует фрагмент и выделяет в нём совпадения тегом <mark>."""
+    return mark_safe(
+        escape(fragment).replace(
+            MATCH_START, '<mark>'
+        ).replace(MATCH_END, '</mark>')
+    )
+
+
+def fetch_page(model, sql, params, page, size):
+    """Объекты страницы ``page`` и признак того, что есть следующая."""
+    objects = list(model.objects.raw(
+        sql, (*params, size + 1, (page - 1) * size)
+    ))
+    for obj in objects:
+        obj.text_match = highlight(obj.text_match)
+        if hasattr(obj, 'title_match'):
+            obj.title_match = highlight(obj.title_match)
+    return objects[:size], len(objects) > size
+
+
+def search_news(query, page, size):
+    """
+    Новости и комментарии, подходящие под запрос, лучшие первыми.
+
+    У найденных объектов есть атрибуты ``text_match`` (и ``title_match``
+    у новостей) с выделенными совпадениями. Для каждого из двух списков
+    возвращается признак наличия следующей страницы.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return [], False, [], False
+    news, more_news = fetch_page(
+        News,
+        SEARCH_NEWS,
+        (MATCH_START, MATCH_END, MATCH_START, MATCH_END, expression),
+        page,
+        size,
+    )
+    comments, more_comments = fetch_page(
+        Comment,
+        SEARCH_COMMENTS,
+        (MATCH_START, MATCH_END, expression),
+        page,
+        size,
+    )
+    return news, more_news, comments, more_comments
+
+
+def rebuild_search_index():
+    """Заново строит индексы по всем новостям и комментариям."""
+    with connection.cursor() as cursor:
+        for statement in REBUILD_SEARCH_INDEX:
+            cursor.execute(statement)
+
+
+def optimize_search_index():
+    """
+    Сливает части индексов в одну после массовой загрузки.
+
+    Триггеры обновляют индекс построчно, и после загрузки он состоит
+    из множества мелких частей, которые замедляют поиск.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in OPTIMIZE_SEARCH_INDEX:
+            cursor.execute(statement)
+
+
+def create_search_index(sender, using, **kwargs):
+    """
+    Создаёт поисковый индекс, если таблицы построены без миграций.
+
+    Подключается к сигналу post_migrate. При обычных миграциях индекс
+    создаёт миграция, и обработчик ничего не делает.
+    """
+    if MigrationLoader.migrations_module(sender.label)[0] is not None:
+        return
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in CREATE_SEARCH_INDEX:
+            cursor.execute(statement)
@@ -0,0 +1,74 @@
+from contextvars import ContextVar
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_news_version
+from .models import (
+    Comment,
+    News,
+    comment_count_subquery,
+    last_comment_subquery,
+)
+
+# Новости, которые сейчас удаляются вместе с комментариями.
+_deleted_news = ContextVar('deleted_news', default=frozenset())
+
+
+@receiver(pre_delete, sender=News)
+def news_deleting(sender, instance, **kwargs):
+    """
+    Запоминает удаляемую новость.
+
+    Комментарии удаляются раньше новости, и пересчитывать счётчики и
+    сбрасывать кеш на каждый из них незачем.
+    """
+    _deleted_news.set(_deleted_news.get() | {instance.pk})
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Новый комментарий увеличивает счётчик у новости."""
+    stats = {'last_comment_at': last_comment_subquery()}
+    if created:
+        stats['comment_count'] = F('comment_count') + 1
+    News.objects.filter(pk=instance.news_id).update(**stats)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """
+    Удалённый комментарий пересчитывает счётчик у новости.
+
+    Счётчик пересчитывается, а не уменьшается: повторное удаление того
+    же комментария иначе увело бы его ниже настоящего числа.
+    """
+    if instance.news_id in _deleted_news.get():
+        return
+    News.objects.filter(pk=instance.news_id).update(
+        comment_count=comment_count_subquery(),
+        last_comment_at=last_comment_subquery(),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_news(sender, instance, **kwargs):
+    """Изменение комментария сбрасывает кеш новости."""
+    if instance.news_id in _deleted_news.get():
+        return
+    bump_news_version(instance.news_id)
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def invalidate_news(sender, instance, **kwargs):
+    """Изменение новости сбрасывает её кеш."""
+    bump_news_version(instance.pk)
+
+
+@receiver(post_delete, sender=News)
+def news_deleted(sender, instance, **kwargs):
+    """Новость удалена вместе с комментариями."""
+    _deleted_news.set(_deleted_news.get() - {instance.pk})
@@ -1,12 +1,19 @@
 from django.urls import path
 
 from news import views
+from news.feeds import LatestNewsAtomFeed, LatestNewsFeed, cached_feed
 
 app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsList.as_view(), name='home'),
     path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('export/', views.NewsExport.as_view(), name='export'),
+    path('feed/rss/', cached_feed(LatestNewsFeed(), 'rss'), name='feed'),
+    path(
+        'feed/atom/', cached_feed(LatestNewsAtomFeed(), 'atom'), name='atom'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
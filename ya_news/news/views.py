@@ -1,39 +1,73 @@
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.contrib.auth.mixins import (
+    LoginRequiredMixin,
+    UserPassesTestMixin,
+)
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse
 from django.views import generic
 
+from .cache import (
+    AnonymousPageCacheMixin,
+    get_comment_block,
+    get_news_list_version,
+    get_news_version,
+)
+from .export import FORMATS, export_lines
 from .forms import CommentForm
 from .models import Comment, News
+from .search import search_news
 
 
-class NewsList(generic.ListView):
+class NewsList(AnonymousPageCacheMixin, generic.ListView):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
 
+    def get_page_version(self):
+        return get_news_list_version()
+
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        return self.model.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
 
+class NewsCommentsMixin:
+    """Добавляет в контекст порцию комментариев к новости."""
+
+    def get_context_data(self, **kwargs):
+        """
+        Комментарии выводятся порциями по курсору из параметра ``after``.
 
-class NewsDetail(generic.DetailView):
+        Размер порции определяется в настройках проекта. Отрисованные
+        порции берутся из кеша.
+        """
+        context = super().get_context_data(**kwargs)
+        try:
+            comments, next_cursor = get_comment_block(
+                self.object, self.request.GET.get('after')
+            )
+        except ValueError:
+            raise Http404('Некорректный курсор комментариев.')
+        context['comments'] = comments
+        context['next_cursor'] = next_cursor
+        return context
+
+
+class NewsDetail(
+        AnonymousPageCacheMixin,
+        NewsCommentsMixin,
+        generic.DetailView
+):
     model = News
     template_name = 'news/detail.html'
 
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+    def get_page_version(self):
+        return get_news_version(self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -44,6 +78,7 @@ class NewsDetail(generic.DetailView):
 
 class NewsComment(
         LoginRequiredMixin,
+        NewsCommentsMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -78,6 +113,62 @@ class NewsDetailView(generic.View):
         return view(request, *args, **kwargs)
 
 
+class NewsSearch(generic.TemplateView):
+    """Поиск по новостям и комментариям."""
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        """
+        Совпадения по запросу из параметра ``q`` на странице ``page``.
+
+        Размер страницы и число доступных страниц определяются
+        в настройках проекта.
+        """
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '')
+        try:
+            page = int(self.request.GET.get('page', 1))
+        except ValueError:
+            raise Http404('Некорректный номер страницы.')
+        if not 1 <= page <= settings.SEARCH_MAX_PAGE:
+            raise Http404('Некорректный номер страницы.')
+        news, more_news, comments, more_comments = search_news(
+            query, page, settings.NEWS_COUNT_ON_SEARCH_PAGE
+        )
+        context.update(
+            query=query,
+            page=page,
+            news_list=news,
+            comment_list=comments,
+            has_next=(
+                (more_news or more_comments)
+                and page < settings.SEARCH_MAX_PAGE
+            ),
+        )
+        return context
+
+
+class NewsExport(LoginRequiredMixin, UserPassesTestMixin, generic.View):
+    """Потоковая выгрузка новостей с комментариями для аналитики."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        """Формат выбирается параметром ``format``: csv или jsonl."""
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in FORMATS:
+            raise Http404('Неизвестный формат выгрузки.')
+        response = StreamingHttpResponse(
+            export_lines(export_format, settings.EXPORT_CHUNK_SIZE),
+            content_type=FORMATS[export_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="news.{export_format}"'
+        )
+        return response
+
+
 class CommentBase(LoginRequiredMixin):
     """Базовый класс для работы с комментариями."""
     model = Comment
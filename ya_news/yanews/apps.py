@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+class YanewsConfig(AppConfig):
+    name = 'yanews'
+
+    def ready(self):
+        from .cache import create_cache_table
+        from .sqlite import check_connections, configure_connection
+        connection_created.connect(configure_connection)
+        request_started.connect(check_connections)
+        post_migrate.connect(
+            create_cache_table, dispatch_uid='yanews.create_cache_table'
+        )
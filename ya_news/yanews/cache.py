@@ -0,0 +1,14 @@
+from django.core.management import call_command
+
+CACHE_APP_LABEL = 'django_cache'
+
+
+def create_cache_table(sender, using, **kwargs):
+    """
+    Создаёт таблицу для DatabaseCache вместе с остальными таблицами.
+
+    Подключается к сигналу post_migrate, чтобы после ``migrate`` не нужно
+    было отдельно запускать ``createcachetable``. Команда пропускает уже
+    созданные таблицы и кеши с другими бэкендами.
+    """
+    call_command('createcachetable', database=using, verbosity=0)
@@ -0,0 +1,107 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Счётчики одного запроса; время хранится в секундах."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.view_name = None
+        self.view_started = None
+        self.view = 0.0
+        self.template_started = None
+        self.template = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def finish_view(self):
+        if self.view_started is not None:
+            self.view = time.perf_counter() - self.view_started
+            self.view_started = None
+
+    def finish_template(self, response):
+        self.template = time.perf_counter() - self.template_started
+        return response
+
+
+class RequestTimingMiddleware:
+    """
+    Считает запросы к базе, время базы, шаблонов и представления.
+
+    Итог отдаётся в заголовке ``Server-Timing`` и пишется в лог одной
+    строкой JSON. Запросы, превысившие ``QUERY_BUDGET``, логируются
+    с уровнем WARNING. Шаблоны, отрисованные внутри представления
+    (например, через ``render``), входят во время представления.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        request.timing = stats
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(stats.record_query)
+                )
+            response = self.get_response(request)
+        stats.finish_view()
+        total = time.perf_counter() - stats.started
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={stats.db * 1000:.1f};desc="{stats.queries} queries"',
+            f'view;dur={stats.view * 1000:.1f}',
+            f'tpl;dur={stats.template * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+        self.log(request, response, stats, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view_started = time.perf_counter()
+        request.timing.view_name = getattr(
+            request.resolver_match, 'view_name', None
+        )
+
+    def process_template_response(self, request, response):
+        stats = request.timing
+        stats.finish_view()
+        stats.template_started = time.perf_counter()
+        response.add_post_render_callback(stats.finish_template)
+        return response
+
+    def log(self, request, response, stats, total):
+        budget = settings.QUERY_BUDGET
+        over_budget = budget is not None and stats.queries > budget
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': stats.view_name,
+            'status': response.status_code,
+            'queries': stats.queries,
+            'db_ms': round(stats.db * 1000, 1),
+            'view_ms': round(stats.view * 1000, 1),
+            'template_ms': round(stats.template * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+        }
+        if over_budget:
+            record['query_budget'] = budget
+            logger.warning('request %s', json.dumps(record))
+        else:
+            logger.info('request %s', json.dumps(record))
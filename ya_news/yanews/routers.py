@@ -0,0 +1,117 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .cache import CACHE_APP_LABEL
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+# Алиас реплики, с которой читает текущий запрос; None — основная база.
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def choose_replica():
+    """Реплика для всего запроса или None, если реплик нет."""
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def _reads_from(alias):
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_reads():
+    """
+    Направляет чтение внутри блока на одну из реплик DATABASE_REPLICAS.
+
+    Реплика выбирается один раз на весь блок, чтобы запросы одной
+    страницы не видели разные по отставанию копии базы.
+    """
+    return _reads_from(choose_replica())
+
+
+def primary_reads():
+    """
+    Направляет чтение внутри блока в основную базу.
+
+    Нужен тому, что кладётся в кеш под только что сменённой версией
+    данных: отстающая реплика могла ещё не получить запись, которая
+    её сменила, и устаревшая копия осталась бы в кеше под новой версией.
+    """
+    return _reads_from(None)
+
+
+class ReplicaRouter:
+    """
+    Читает с реплик, когда это разрешено, пишет всегда в основную базу.
+
+    Вне ``replica_reads`` всё идёт в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Версии и блокировки DatabaseCache читаются только из основной
+        # базы, иначе отставание реплики вернёт устаревшую версию.
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return 'default'
+        return _read_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Включает чтение с реплик для безопасных запросов.
+
+    С реплик читают представления из ``REPLICA_VIEWS`` и все запросы
+    анонимов. После запроса с записью браузер получает cookie
+    ``REPLICA_PIN_COOKIE``, и следующие ``REPLICA_PIN_SECONDS`` секунд
+    пользователь читает из основной базы, чтобы видеть свои изменения
+    даже при отставании реплик.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_reads = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_reads is not None:
+                _read_alias.reset(request.replica_reads)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES
+        ):
+            return None
+        # Сессия и пользователь читаются из основной базы: только что
+        # созданная сессия могла ещё не дойти до реплики.
+        anonymous = not request.user.is_authenticated
+        view_name = request.resolver_match.view_name
+        if anonymous or view_name in settings.REPLICA_VIEWS:
+            request.replica_reads = _read_alias.set(choose_replica())
+        return None
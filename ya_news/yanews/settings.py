@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -17,15 +18,18 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'yanews.apps.YanewsConfig',
     'news.apps.NewsConfig',
 ]
 
 MIDDLEWARE = [
+    'yanews.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'yanews.routers.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -55,6 +59,49 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами и проверяется перед каждым.
+        'CONN_MAX_AGE': 600,
+    }
+}
+
+# Алиасы баз из DATABASES, с которых можно читать. Для проверки на своей
+# машине достаточно указать в YANEWS_REPLICA_DB путь к копии db.sqlite3.
+DATABASE_REPLICAS = []
+if os.environ.get('YANEWS_REPLICA_DB'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['YANEWS_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica')
+
+DATABASE_ROUTERS = ['yanews.routers.ReplicaRouter']
+
+# Представления, которые читают с реплик и для вошедших пользователей.
+REPLICA_VIEWS = ('news:home', 'news:detail')
+
+# Cookie, по которой после записи чтение идёт из основной базы.
+REPLICA_PIN_COOKIE = 'use_primary'
+
+REPLICA_PIN_SECONDS = 10
+
+# Настройки SQLite для каждого нового соединения.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ, а не в страницах.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Кеш общий для всех процессов: версии данных, страницы и блокировки их
+# перерисовки должны быть видны каждому воркеру. Таблицу создаёт migrate.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
     }
 }
 
@@ -80,3 +127,57 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_NEWS_PAGE = 50
+
+NEWS_COUNT_ON_SEARCH_PAGE = 10
+
+# Дальше поиск не листается: глубокий OFFSET дорог и бесполезен.
+SEARCH_MAX_PAGE = 100
+
+EXPORT_CHUNK_SIZE = 2000
+
+NEWS_COUNT_IN_FEED = 20
+
+# Файл с дополнительными запрещёнными словами, по одному на строку.
+BAD_WORDS_FILE = None
+
+COMMENT_BLOCK_CACHE_TIMEOUT = 60 * 60 * 24
+
+PAGE_CACHE_TIMEOUT = 60
+
+PAGE_CACHE_STALE_TIMEOUT = 60 * 10
+
+PAGE_CACHE_LOCK_TIMEOUT = 10
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Сколько запросов к базе допустимо на один HTTP-запрос; None — без лимита.
+QUERY_BUDGET = 30
+
+# Строки о запросах и прогреве пишутся с уровнем INFO; без своего
+# обработчика Python выводит только WARNING и выше.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'yanews': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# Прогревать процесс при запуске через wsgi.py, до первого запроса.
+WARMUP_ON_START = os.environ.get('YANEWS_WARMUP') == '1'
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import connections
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    Применяет ``SQLITE_PRAGMAS`` к каждому новому соединению с SQLite.
+
+    Подключается к сигналу connection_created. WAL позволяет читать,
+    пока идёт запись, а busy_timeout заставляет писателей ждать друг
+    друга, а не падать с «database is locked».
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connections(**kwargs):
+    """
+    Закрывает сломанные постоянные соединения перед запросом.
+
+    Подключается к сигналу request_started. Проверка идёт в обход
+    курсоров Django, поэтому не попадает в счётчики запросов.
+    """
+    for connection in connections.all():
+        if connection.connection is None or connection.vendor != 'sqlite':
+            continue
+        try:
+            connection.connection.execute('SELECT 1')
+        except connection.Database.Error:
+            connection.close()
@@ -0,0 +1,59 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = 'Выгружает заметки в формате JSON Lines.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--author', help='Выгрузить только заметки этого пользователя.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько строк читать из базы за раз.'
+        )
+        parser.add_argument(
+            '--progress-every', type=int, default=100_000,
+            help='Как часто сообщать о ходе выгрузки, в строках.'
+        )
+
+    def handle(self, *args, **options):
+        notes = Note.objects.order_by('pk')
+        if options['author']:
+            notes = notes.filter(author__username=options['author'])
+        rows = notes.values(
+            'title', 'text', 'slug', 'author__username'
+        ).iterator(chunk_size=options['chunk_size'])
+        if options['output'] == '-':
+            self.export(rows, sys.stdout, options['progress_every'])
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                self.export(rows, output, options['progress_every'])
+
+    def export(self, rows, output, progress_every):
+        started = time.monotonic()
+        count = 0
+        for row in rows:
+            row['author'] = row.pop('author__username')
+            output.write(json.dumps(row, ensure_ascii=False) + '\n')
+            count += 1
+            if count % progress_every == 0:
+                self.report(count, started)
+        self.report(count, started)
+
+    def report(self, count, started):
+        # Прогресс идёт в stderr, чтобы не смешиваться с выгрузкой.
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stderr.write(
+            f'Выгружено {count} заметок, {count / elapsed:.0f} строк/с'
+        )
@@ -0,0 +1,146 @@
+import random
+import time
+from contextlib import contextmanager
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from notes.models import Note
+from notes.search import optimize_search_index
+
+User = get_user_model()
+
+WORDS = (
+    'купить молоко хлеб позвонить маме встреча проект отчёт письмо '
+    'задача идея книга фильм список дела врач запись оплатить счёт '
+    'подарок день рождения отпуск билеты поезд гостиница план неделя '
+    'тренировка рецепт ужин ремонт кухня машина сервис документы'
+).split()
+
+
+@contextmanager
+def relaxed_pragmas():
+    """
+    Отключает синхронную запись SQLite на время загрузки.
+
+    При сбое посреди загрузки база может потерять последние транзакции,
+    поэтому настройки возвращаются сразу после неё. Внутри открытой
+    транзакции SQLite не даёт их менять, и загрузка идёт как обычно.
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        synchronous = cursor.fetchone()[0]
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+        cursor.execute('PRAGMA synchronous = OFF')
+        cursor.execute('PRAGMA journal_mode = MEMORY')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA synchronous = {synchronous}')
+            cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+
+
+def zipf_weights(size):
+    """Накопленные веса, при которых k-й элемент в k раз реже первого."""
+    return list(accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями и заметками. '
+        'Заметки распределены неравномерно: у немногих пользователей их '
+        'большая часть. При одинаковом seed данные получаются одинаковыми.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--notes', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Сколько строк создавать одним запросом.'
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=200_000,
+            help='Сколько строк сохранять в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = f'gen{options["seed"]}'
+        self.batch_size = options['batch_size']
+        self.transaction_size = options['transaction_size']
+        self.started = time.monotonic()
+        with relaxed_pragmas():
+            user_ids = self.create_users(options['users'])
+            self.create_notes(options['notes'], user_ids)
+            optimize_search_index()
+        self.stdout.write(self.style.SUCCESS(self.progress('Готово')))
+
+    def bulk_create(self, model, objects, total, label):
+        """Сохраняет объекты пачками, по несколько пачек в транзакции."""
+        created = 0
+        while created < total:
+            with transaction.atomic():
+                limit = min(total, created + self.transaction_size)
+                while created < limit:
+                    size = min(self.batch_size, limit - created)
+                    model.objects.bulk_create(
+                        next(objects) for _ in range(size)
+                    )
+                    created += size
+            self.stdout.write(
+                self.progress(f'{label}: {created}')
+            )
+
+    def create_users(self, count):
+        self.bulk_create(
+            User,
+            (
+                User(username=f'{self.prefix}_{index}', password='!')
+                for index in range(count)
+            ),
+            count,
+            'Пользователи',
+        )
+        return list(
+            User.objects.filter(username__startswith=f'{self.prefix}_')
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_notes(self, count, user_ids):
+        self.rng.shuffle(user_ids)
+        weights = zipf_weights(len(user_ids))
+
+        def notes():
+            index = 0
+            while True:
+                authors = self.rng.choices(
+                    user_ids, cum_weights=weights, k=self.batch_size
+                )
+                for author_id in authors:
+                    # Slug по номеру уникален и не требует запросов
+                    # к базе, в отличие от подбора по заголовку.
+                    yield Note(
+                        title=self.sentence(2, 6)[:100],
+                        text=self.sentence(5, 120),
+                        slug=f'{self.prefix}-{index}',
+                        author_id=author_id,
+                    )
+                    index += 1
+
+        self.bulk_create(Note, notes(), count, 'Заметки')
+
+    def sentence(self, shortest, longest):
+        words = self.rng.choices(WORDS, k=self.rng.randint(shortest, longest))
+        return ' '.join(words).capitalize() + '.'
+
+    def progress(self, message):
+        return f'{message} ({time.monotonic() - self.started:.1f} с)'
@@ -0,0 +1,104 @@
+import json
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает заметки из файла JSON Lines. Каждая строка — объект '
+        'с полями title, text, author (имя пользователя) и необязательным '
+        'slug; пустые slug подбираются так же, как при сохранении заметки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл для загрузки; «-» — стандартный ввод.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько заметок создавать одним запросом.'
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=50_000,
+            help='Сколько заметок сохранять в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.transaction_size = options['transaction_size']
+        self.authors = {}
+        self.count = 0
+        self.started = time.monotonic()
+        if options['path'] == '-':
+            self.load(sys.stdin)
+        else:
+            with open(options['path'], encoding='utf-8') as source:
+                self.load(source)
+        self.stdout.write(self.style.SUCCESS(self.progress()))
+
+    def load(self, source):
+        lines = enumerate(source, start=1)
+        while True:
+            with transaction.atomic():
+                saved = 0
+                while saved < self.transaction_size:
+                    batch = self.read_batch(lines)
+                    if not batch:
+                        return
+                    self.save(batch)
+                    saved += len(batch)
+            self.stdout.write(self.progress())
+
+    def read_batch(self, lines):
+        batch = []
+        for number, line in lines:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                batch.append(Note(
+                    title=data['title'],
+                    text=data['text'],
+                    slug=data.get('slug') or '',
+                    author_id=self.get_author_id(data['author']),
+                ))
+            except (ValueError, KeyError, TypeError) as error:
+                raise CommandError(f'Строка {number}: {error!r}')
+            if len(batch) == self.batch_size:
+                break
+        return batch
+
+    def get_author_id(self, username):
+        if username not in self.authors:
+            try:
+                self.authors[username] = User.objects.get(
+                    username=username
+                ).pk
+            except User.DoesNotExist:
+                raise KeyError(f'нет пользователя {username}')
+        return self.authors[username]
+
+    def save(self, batch):
+        Note.assign_slugs(batch)
+        try:
+            Note.objects.bulk_create(batch)
+        except IntegrityError as error:
+            raise CommandError(
+                f'Не удалось сохранить заметки после {self.count}-й: {error}'
+            )
+        self.count += len(batch)
+
+    def progress(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f'Загружено {self.count} заметок, '
+            f'{self.count / elapsed:.0f} строк/с'
+        )
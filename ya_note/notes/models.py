@@ -1,7 +1,10 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
-from pytils.translit import slugify
+from .slugs import allocate_slugs
+
+# Сколько раз подбирать slug заново, если его занял параллельный запрос.
+SLUG_ATTEMPTS = 5
 
 
 class Note(models.Model):
@@ -28,11 +31,46 @@ class Note(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('author', 'slug'), name='note_author_slug_idx'
+            ),
+        )
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def assign_slugs(cls, notes):
+        """Заполняет пустые slug у пачки несохранённых заметок."""
+        pending = [note for note in notes if not note.slug]
+        slugs = allocate_slugs(
+            cls.objects.all(),
+            [note.title for note in pending],
+            cls._meta.get_field('slug').max_length,
+            reserved=[note.slug for note in notes if note.slug],
+        )
+        for note, slug in zip(pending, slugs):
+            note.slug = slug
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug, = allocate_slugs(
+                Note.objects.exclude(pk=self.pk),
+                [self.title],
+                max_slug_length,
+            )
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                clash = Note.objects.filter(
+                    slug=self.slug
+                ).exclude(pk=self.pk).exists()
+                if not clash or attempt == SLUG_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
@@ -0,0 +1,123 @@
+import re
+
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+
+from .models import Note
+
+SEARCH_TABLE = 'notes_note_fts'
+
+CREATE_SEARCH_INDEX = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, text, author_id,
+        content='notes_note', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO {SEARCH_TABLE}(
+            {SEARCH_TABLE}, rowid, title, text, author_id
+        )
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO {SEARCH_TABLE}(
+            {SEARCH_TABLE}, rowid, title, text, author_id
+        )
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+)
+REBUILD_SEARCH_INDEX = (
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+)
+OPTIMIZE_SEARCH_INDEX = (
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"
+)
+
+# Автор — тоже колонка индекса, поэтому MATCH сразу ограничен заметками
+# пользователя, а не перебирает совпадения всех пользователей. В ранжировании
+# автор не участвует: вес его колонки нулевой.
+SEARCH_NOTES = f"""
+    SELECT notes_note.id, notes_note.title, notes_note.slug
+    FROM {SEARCH_TABLE}
+    JOIN notes_note ON notes_note.id = {SEARCH_TABLE}.rowid
+    WHERE {SEARCH_TABLE} MATCH %s AND notes_note.author_id = %s
+    ORDER BY bm25({SEARCH_TABLE}, 1.0, 1.0, 0.0)
+    LIMIT %s
+"""
+
+
+def match_expression(query):
+    """
+    Превращает пользовательский запрос в выражение FTS5.
+
+    Каждое слово берётся в кавычки, чтобы операторы FTS5 в запросе не
+    ломали синтаксис, и ищется как префикс в заголовке и тексте. Слова
+    объединяются через И.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return ''
+    phrases = ' '.join(f'"{word}"*' for word in words)
+    return f'{{title text}} : ({phrases})'
+
+
+def search_notes(user, query, limit):
+    """Заметки пользователя, подходящие под запрос, по убыванию bm25."""
+    expression = match_expression(query)
+    if not expression:
+        return Note.objects.none()
+    expression = f'author_id : "{user.pk}" AND {expression}'
+    return Note.objects.raw(SEARCH_NOTES, (expression, user.pk, limit))
+
+
+def rebuild_search_index():
+    """Заново строит индекс по всем заметкам."""
+    with connection.cursor() as cursor:
+        cursor.execute(REBUILD_SEARCH_INDEX)
+
+
+def optimize_search_index():
+    """
+    Сливает части индекса в одну после массовой загрузки.
+
+    Триггер обновляет индекс построчно, и после загрузки он состоит
+    из множества мелких частей, которые замедляют поиск.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(OPTIMIZE_SEARCH_INDEX)
+
+
+def create_search_index(sender, using, **kwargs):
+    """
+    Создаёт индекс заметок, если таблицы построены без миграций.
+
+    Подключается к сигналу post_migrate. При обычных миграциях индекс
+    создаёт миграция, и обработчик ничего не делает.
+    """
+    if MigrationLoader.migrations_module(sender.label)[0] is not None:
+        return
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in CREATE_SEARCH_INDEX:
+            cursor.execute(statement)
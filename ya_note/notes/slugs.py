@@ -0,0 +1,76 @@
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from pytils.translit import slugify
+
+DEFAULT_SLUG = 'note'
+# Место под суффикс вида «-123456» у обрезанного slug.
+SUFFIX_RESERVE = 7
+# SQLite ограничивает глубину выражения, поэтому условия дробятся.
+RANGES_PER_QUERY = 300
+# Верхняя граница для диапазонного поиска по префиксу.
+MAX_CHAR = '\U0010ffff'
+
+
+def base_slug(title, max_length):
+    return slugify(title)[:max_length] or DEFAULT_SLUG
+
+
+def clashing_range(base, max_length):
+    """
+    Диапазон slug, которые могут помешать ``base`` и его вариантам.
+
+    Для коротких slug это он сам и его варианты с суффиксом: в slug нет
+    символов меньше дефиса, поэтому других строк в диапазоне нет. У
+    длинных суффикс заменяет конец, поэтому берётся всё, что начинается
+    с неизменной части.
+    """
+    stem = base[:max_length - SUFFIX_RESERVE]
+    if stem != base:
+        return stem, stem + MAX_CHAR
+    return base, base + '-' + MAX_CHAR
+
+
+def allocate_slugs(queryset, titles, max_length, reserved=()):
+    """
+    Уникальные slug для пачки заголовков.
+
+    Все slug, с которыми могут совпасть нужные, выбираются одним
+    запросом по индексу, после чего к повторам в памяти добавляются
+    суффиксы ``-2``, ``-3`` и так далее. ``reserved`` — slug, которые
+    уже заняты, но ещё не сохранены в базе.
+    """
+    bases = [base_slug(title, max_length) for title in titles]
+    ranges = sorted({clashing_range(base, max_length) for base in bases})
+    quote_name = connections[queryset.db].ops.quote_name
+    column = (
+        f'{quote_name(queryset.model._meta.db_table)}.{quote_name("slug")}'
+    )
+    taken = set(reserved)
+    # Условие собирается строкой: с сотнями Q-объектов ORM тратит на
+    # сборку запроса в несколько раз больше времени, чем база на него.
+    for start in range(0, len(ranges), RANGES_PER_QUERY):
+        chunk = ranges[start:start + RANGES_PER_QUERY]
+        condition = RawSQL(
+            ' OR '.join([f'({column} >= %s AND {column} < %s)'] * len(chunk)),
+            [bound for bounds in chunk for bound in bounds],
+            output_field=BooleanField(),
+        )
+        taken.update(
+            queryset.alias(clashes=condition)
+            .filter(clashes=True)
+            .values_list('slug', flat=True)
+        )
+    slugs = []
+    suffixes = {}
+    for base in bases:
+        slug = base
+        suffix = suffixes.get(base, 1)
+        while slug in taken:
+            suffix += 1
+            tail = f'-{suffix}'
+            slug = base[:max_length - len(tail)] + tail
+        suffixes[base] = suffix
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
@@ -0,0 +1,19 @@
+"""Фабрики тестовых данных: заметки создаются пачками, а не по одной."""
+from notes.models import Note
+
+
+def make_notes(author, indexes, text='Текст заметки', slug='note-{index}'):
+    """
+    Создаёт заметки автора с номерами из ``indexes`` одним запросом.
+
+    Slug строится по номеру, поэтому подбирать его не нужно.
+    """
+    return Note.objects.bulk_create(
+        Note(
+            title=f'Заметка {index}',
+            text=text,
+            slug=slug.format(index=index, author=author.pk),
+            author=author,
+        )
+        for index in indexes
+    )
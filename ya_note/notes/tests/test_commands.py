@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from pytils.translit import slugify
+
+from notes.models import Note
+from notes.search import search_notes
+
+User = get_user_model()
+
+
+class TestCommands(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.notes = Note.objects.create(
+            title='Заголовок',
+            text='Текст',
+            slug='note-slug',
+            author=cls.author
+        )
+
+    def test_export_and_import_notes(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'notes.jsonl')
+        call_command('export_notes', output=path, stderr=StringIO())
+        with open(path, encoding='utf-8') as source:
+            exported = [json.loads(line) for line in source]
+        self.assertEqual(exported, [{
+            'title': self.notes.title,
+            'text': self.notes.text,
+            'slug': self.notes.slug,
+            'author': self.author.username,
+        }])
+        with open(path, 'a', encoding='utf-8') as source:
+            source.write(json.dumps({
+                'title': self.notes.title,
+                'text': 'Без адреса',
+                'author': self.reader.username,
+            }) + '\n')
+        Note.objects.all().delete()
+        call_command(
+            'import_notes', path, batch_size=1, transaction_size=1,
+            stdout=StringIO()
+        )
+        self.assertEqual(
+            list(Note.objects.order_by('pk').values_list('slug', 'author')),
+            [
+                (self.notes.slug, self.author.pk),
+                (slugify(self.notes.title), self.reader.pk),
+            ]
+        )
+
+    def test_generate_notes_command(self):
+        def snapshot():
+            return list(
+                Note.objects.filter(slug__startswith='gen1-')
+                .order_by('pk').values_list('title', 'author__username')
+            )
+
+        options = {'users': 10, 'notes': 300, 'seed': 1}
+        call_command('generate_notes', stdout=StringIO(), **options)
+        first = snapshot()
+        self.assertEqual(len(first), 300)
+        per_user = {}
+        for _, username in first:
+            per_user[username] = per_user.get(username, 0) + 1
+        self.assertGreater(
+            max(per_user.values()), 300 / 10 * 2,
+            'Заметки должны распределяться неравномерно.'
+        )
+        author = User.objects.get(username=first[0][1])
+        self.assertTrue(search_notes(author, first[0][0].split()[0], 1))
+        User.objects.filter(username__startswith='gen1_').delete()
+        call_command('generate_notes', stdout=StringIO(), **options)
+        self.assertEqual(snapshot(), first)
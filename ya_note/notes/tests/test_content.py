@@ -1,11 +1,20 @@
 from http import HTTPStatus
+from io import StringIO
+import logging
+import tracemalloc
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytils.translit import slugify
 
 from notes.forms import WARNING
 from notes.models import Note
+from notes.search import SEARCH_TABLE
+from .factories import make_notes
 
 User = get_user_model()
 
@@ -17,6 +26,8 @@ EDIT_URL = reverse('notes:edit', args=('note-slug',))
 DELETE_URL = reverse('notes:delete', args=('note-slug',))
 SUCCESS_URL = reverse('notes:success')
 LOGIN_URL = reverse('users:login')
+LIST_URL = reverse('notes:list')
+SEARCH_URL = reverse('notes:search')
 
 
 def compare_objects(obj1, obj2, fields):
@@ -131,3 +142,155 @@ class TestContent(TestCase):
         self.assertEqual((notes_after - notes_before), DIFF_EDIT)
         note_from_db = Note.objects.get(id=self.notes.id)
         compare_objects(self.notes, note_from_db, ['title', 'text', 'slug'])
+
+
+@override_settings(NOTES_COUNT_ON_LIST_PAGE=20)
+class TestNotesListScale(TestCase):
+    LARGE_DATASET = 5000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.other = User.objects.create(username='Читатель')
+        for user, count in ((cls.author, 10), (cls.other, cls.LARGE_DATASET)):
+            make_notes(
+                user, range(count),
+                text='Очень длинный текст. ' * 50,
+                slug='{author}-{index}',
+            )
+
+    def get_list(self, user, **params):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            tracemalloc.start()
+            response = self.client.get(LIST_URL, params)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return response, context.captured_queries, peak
+
+    def test_list_is_paginated(self):
+        response, _, _ = self.get_list(self.other)
+        notes = response.context['object_list']
+        self.assertEqual(len(notes), 20)
+        response, _, _ = self.get_list(
+            self.other, after=response.context['next_cursor']
+        )
+        next_notes = response.context['object_list']
+        self.assertEqual(next_notes[0].pk, notes[-1].pk + 1)
+
+    def test_invalid_cursor(self):
+        self.client.force_login(self.author)
+        for after in ('abc', '-1', '99999999999999999999'):
+            with self.subTest(after=after):
+                response = self.client.get(LIST_URL, {'after': after})
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_queries_and_memory_do_not_grow(self):
+        # Первый запрос прогревает шаблоны и URL.
+        self.get_list(self.author)
+        _, small_queries, small_peak = self.get_list(self.author)
+        _, large_queries, large_peak = self.get_list(self.other)
+        self.assertEqual(len(small_queries), len(large_queries))
+        for query in large_queries:
+            self.assertNotIn('"notes_note"."text"', query['sql'])
+        self.assertLess(large_peak, small_peak * 3)
+
+
+class TestNoteSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        cls.title_match = Note.objects.create(
+            title='Покупки на неделю',
+            text='Молоко, хлеб и покупки для дома',
+            slug='shopping',
+            author=cls.author
+        )
+        cls.text_match = Note.objects.create(
+            title='Дела',
+            text='Не забыть про покупки',
+            slug='todo',
+            author=cls.author
+        )
+        cls.foreign = Note.objects.create(
+            title='Покупки',
+            text='Чужие покупки',
+            slug='foreign',
+            author=cls.reader
+        )
+
+    def search(self, query):
+        self.client.force_login(self.author)
+        response = self.client.get(SEARCH_URL, {'q': query})
+        return list(response.context['object_list'])
+
+    def test_results_are_ranked_and_scoped(self):
+        self.assertEqual(
+            self.search('покупки'), [self.title_match, self.text_match]
+        )
+
+    def test_index_follows_changes(self):
+        Note.objects.filter(pk=self.text_match.pk).update(text='Отдых')
+        self.assertEqual(self.search('покуп'), [self.title_match])
+        self.title_match.delete()
+        self.assertEqual(self.search('покупки'), [])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(self.search('дела" (*'), [self.text_match])
+
+    def test_author_is_indexed(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s ORDER BY rowid',
+                (f'author_id : "{self.author.pk}"',)
+            )
+            self.assertEqual(
+                [row for row, in cursor.fetchall()],
+                [self.title_match.pk, self.text_match.pk]
+            )
+        self.assertEqual(self.search(str(self.author.pk)), [])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+                "VALUES ('delete-all')"
+            )
+        self.assertEqual(self.search('дела'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('дела'), [self.text_match])
+
+
+class TestRequestTiming(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+
+    def test_server_timing_header(self):
+        self.client.force_login(self.author)
+        response = self.client.get(LIST_URL)
+        for metric in ('db;dur=', 'view;dur=', 'tpl;dur=', 'total;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, response['Server-Timing'])
+
+    @override_settings(QUERY_BUDGET=0)
+    def test_query_budget_is_logged(self):
+        self.client.force_login(self.author)
+        with self.assertLogs('yanote.middleware', 'WARNING') as logs:
+            self.client.get(LIST_URL)
+        self.assertIn('"view": "notes:list"', logs.output[0])
+
+    def test_request_log_has_handler(self):
+        handler, = logging.getLogger('yanote').handlers
+        stream = StringIO()
+        previous = handler.setStream(stream)
+        self.client.force_login(self.author)
+        try:
+            self.client.get(LIST_URL)
+        finally:
+            handler.setStream(previous)
+        self.assertIn('INFO yanote.middleware request', stream.getvalue())
@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -136,3 +137,41 @@ class TestContent(TestCase):
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
         notes_after = Note.objects.count()
         self.assertEqual((notes_after - notes_before), DIFF_EDIT)
+
+    def test_empty_slug_gets_suffix(self):
+        self.form_data.pop('slug')
+        self.form_data['title'] = self.notes.title
+        Note.objects.create(
+            title='Заголовок',
+            text='Текст',
+            slug='zagolovok',
+            author=self.author
+        )
+        self.client.force_login(self.author)
+        self.client.post(reverse('notes:add'), data=self.form_data)
+        self.assertTrue(Note.objects.filter(slug='zagolovok-2').exists())
+
+    def test_bulk_slugs(self):
+        notes = [
+            Note(title=title, text='Текст', author=self.author)
+            for title in ('Заметка', 'Заметка', 'Другая')
+        ]
+        notes.append(
+            Note(title='Заметка', text='Текст', slug='zametka-3',
+                 author=self.author)
+        )
+        with self.assertNumQueries(1):
+            Note.assign_slugs(notes)
+        self.assertEqual(
+            [note.slug for note in notes],
+            ['zametka', 'zametka-2', 'drugaya', 'zametka-3']
+        )
+
+    def test_slug_race_is_retried(self):
+        note = Note(title=self.notes.title, text='Текст', author=self.author)
+        with patch(
+            'notes.models.allocate_slugs',
+            side_effect=[[self.notes.slug], ['zagolovok']]
+        ):
+            note.save()
+        self.assertEqual(note.slug, 'zagolovok')
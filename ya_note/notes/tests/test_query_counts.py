@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from notes.models import Note
+from notes.urls import urlpatterns
+from .factories import make_notes
+
+User = get_user_model()
+
+SIZES = (1, 10, 1000)
+
+URLS = {
+    'home': reverse('notes:home'),
+    'add': reverse('notes:add'),
+    'edit': reverse('notes:edit', args=('note-0',)),
+    'detail': reverse('notes:detail', args=('note-0',)),
+    'delete': reverse('notes:delete', args=('note-0',)),
+    'list': reverse('notes:list'),
+    'search': reverse('notes:search'),
+    'success': reverse('notes:success'),
+}
+PARAMS = {'search': {'q': 'заметка'}}
+
+
+class TestQueryCounts(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+
+    def setUp(self):
+        self.client.force_login(self.author)
+
+    def grow_notes(self, size):
+        """Доводит число заметок автора до ``size``."""
+        make_notes(self.author, range(Note.objects.count(), size))
+
+    def test_every_url_is_covered(self):
+        self.assertEqual(
+            {pattern.name for pattern in urlpatterns}, set(URLS)
+        )
+
+    def test_query_count_does_not_grow(self):
+        counts = {name: {} for name in URLS}
+        for size in SIZES:
+            self.grow_notes(size)
+            for name, url in URLS.items():
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(url, PARAMS.get(name))
+                counts[name][size] = len(queries)
+        for name, url in URLS.items():
+            with self.subTest(name=name):
+                self.assertEqual(
+                    len(set(counts[name].values())), 1,
+                    f'Число запросов {resolve(url)._func_path} ({name}) '
+                    f'растёт вместе с данными: {counts[name]}'
+                )
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+User = get_user_model()
+
+
+def explain(sql):
+    """План выполнения запроса SQLite в виде списка строк."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class TestQueryPlans(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.notes = Note.objects.create(
+            title='Заголовок',
+            text='Текст',
+            slug='note-slug',
+            author=cls.author
+        )
+
+    def test_pages_use_indexes(self):
+        self.client.force_login(self.author)
+        urls = (
+            ('notes:list', None),
+            ('notes:detail', (self.notes.slug,)),
+            ('notes:edit', (self.notes.slug,)),
+            ('notes:delete', (self.notes.slug,)),
+        )
+        for name, args in urls:
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(reverse(name, args=args))
+            selects = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+            ]
+            for sql in selects:
+                for step in explain(sql):
+                    with self.subTest(name=name, step=step):
+                        self.assertNotIn('TEMP B-TREE', step, sql)
+                        self.assertFalse(
+                            step.startswith('SCAN') and 'USING' not in step,
+                            sql
+                        )
@@ -58,7 +58,8 @@ class TestRoutes(TestCase):
         urls = (
             'notes:list',
             'notes:add',
-            'notes:success'
+            'notes:success',
+            'notes:search',
         )
         for name in urls:
             with self.subTest(name=name):
@@ -72,6 +73,7 @@ class TestRoutes(TestCase):
             ('notes:list', None),
             ('notes:add', None),
             ('notes:success', None),
+            ('notes:search', None),
             ('notes:detail', (self.notes.slug,)),
             ('notes:edit', (self.notes.slug,)),
             ('notes:delete', (self.notes.slug,)),
@@ -0,0 +1,46 @@
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+from yanote.sqlite import check_connections
+
+
+class TestSqliteConnections(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database = DatabaseWrapper({
+            **connection.settings_dict, 'NAME': f'{directory.name}/db.sqlite3'
+        })
+        self.addCleanup(self.database.close)
+
+    def check_connections(self):
+        connections = SimpleNamespace(all=lambda: [self.database])
+        with patch('yanote.sqlite.connections', connections):
+            check_connections()
+
+    def test_pragmas_are_applied(self):
+        with self.database.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(
+                cursor.fetchone()[0], settings.SQLITE_PRAGMAS['busy_timeout']
+            )
+
+    def test_healthy_connection_is_kept(self):
+        self.database.ensure_connection()
+        self.check_connections()
+        self.assertIsNotNone(self.database.connection)
+
+    def test_broken_connection_is_closed_before_request(self):
+        self.database.ensure_connection()
+        self.database.connection.close()
+        self.check_connections()
+        self.assertIsNone(self.database.connection)
@@ -0,0 +1,44 @@
+import logging
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from django.db import connections
+from django.template import engines
+from django.test import TestCase
+
+from yanote.warmup import warm_up
+
+
+class TestWarmUp(TestCase):
+
+    def test_warm_up_compiles_templates(self):
+        loader = engines['django'].engine.template_loaders[0]
+        loader.reset()
+        with self.assertLogs('yanote.warmup', 'INFO') as logs:
+            warm_up()
+        self.assertIn('notes/list.html', loader.get_template_cache)
+        self.assertIn('Прогрев занял', logs.output[0])
+
+    def test_warm_up_time_has_handler(self):
+        handler, = logging.getLogger('yanote').handlers
+        stream = StringIO()
+        previous = handler.setStream(stream)
+        try:
+            warm_up()
+        finally:
+            handler.setStream(previous)
+        self.assertIn('INFO yanote.warmup Прогрев занял', stream.getvalue())
+
+    def test_warm_up_closes_connections(self):
+        with TemporaryDirectory() as directory:
+            connections.settings['warmup'] = {
+                **connections.settings['default'],
+                'NAME': f'{directory}/warmup.sqlite3',
+            }
+            try:
+                connections['warmup'].ensure_connection()
+                warm_up()
+                self.assertIsNone(connections['warmup'].connection)
+            finally:
+                del connections['warmup']
+                del connections.settings['warmup']
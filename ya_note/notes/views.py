@@ -1,9 +1,15 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
 from django.urls import reverse_lazy
 from django.views import generic
 
 from .forms import NoteForm
 from .models import Note
+from .search import search_notes
+
+# Наибольшее целое, которое SQLite принимает как параметр запроса.
+MAX_INTEGER = 2 ** 63 - 1
 
 
 class Home(generic.TemplateView):
@@ -53,7 +59,60 @@ class NotesList(NoteBase, generic.ListView):
     """Список всех заметок пользователя."""
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """
+        Выводим заметки порциями после id из параметра ``after``.
+
+        Размер порции определяется в настройках проекта; из базы читаются
+        только поля, которые показывает список.
+        """
+        queryset = super().get_queryset().only(
+            'id', 'title', 'slug'
+        ).order_by('pk')
+        after = self.request.GET.get('after')
+        if after:
+            try:
+                after = int(after)
+                if not 0 <= after <= MAX_INTEGER:
+                    raise ValueError(after)
+            except ValueError:
+                raise Http404('Некорректный курсор заметок.')
+            queryset = queryset.filter(pk__gt=after)
+        return queryset[:settings.NOTES_COUNT_ON_LIST_PAGE + 1]
+
+    def get_context_data(self, **kwargs):
+        notes = list(self.object_list)
+        next_cursor = None
+        if len(notes) > settings.NOTES_COUNT_ON_LIST_PAGE:
+            notes = notes[:settings.NOTES_COUNT_ON_LIST_PAGE]
+            next_cursor = notes[-1].pk
+        return super().get_context_data(
+            object_list=notes, next_cursor=next_cursor, **kwargs
+        )
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """Полнотекстовый поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        """
+        Лучшие совпадения по запросу из параметра ``q``.
+
+        Их количество определяется в настройках проекта.
+        """
+        return search_notes(
+            self.request.user,
+            self.request.GET.get('q', ''),
+            settings.NOTES_COUNT_ON_SEARCH_PAGE,
+        )
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            query=self.request.GET.get('q', ''), **kwargs
+        )
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+
+class YanoteConfig(AppConfig):
+    name = 'yanote'
+
+    def ready(self):
+        from .sqlite import check_connections, configure_connection
+        connection_created.connect(configure_connection)
+        request_started.connect(check_connections)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -18,10 +19,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'yanote.apps.YanoteConfig',
     'notes.apps.NotesConfig',
 ]
 
 MIDDLEWARE = [
+    'yanote.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,9 +59,21 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами и проверяется перед каждым.
+        'CONN_MAX_AGE': 600,
     }
 }
 
+# Настройки SQLite для каждого нового соединения.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ, а не в страницах.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +102,37 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_COUNT_ON_LIST_PAGE = 100
+
+NOTES_COUNT_ON_SEARCH_PAGE = 50
+
+# Сколько запросов к базе допустимо на один HTTP-запрос; None — без лимита.
+QUERY_BUDGET = 30
+
+# Строки о запросах и прогреве пишутся с уровнем INFO; без своего
+# обработчика Python выводит только WARNING и выше.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'yanote': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# Прогревать процесс при запуске через wsgi.py, до первого запроса.
+WARMUP_ON_START = os.environ.get('YANOTE_WARMUP') == '1'
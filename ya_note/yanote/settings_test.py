@@ -0,0 +1,18 @@
+"""
+Настройки для быстрого прогона тестов.
+
+База создаётся в памяти прямо по моделям, без прогона миграций;
+то, что добавляют только миграции (поисковый индекс), приложения
+создают по сигналу post_migrate. Пароли хешируются MD5, потому что
+медленный хешер в тестах ничего не проверяет.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+DATABASES['default'] = {
+    **DATABASES['default'],
+    'NAME': ':memory:',
+    'TEST': {'NAME': ':memory:', 'MIGRATE': False},
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
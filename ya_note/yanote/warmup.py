@@ -0,0 +1,88 @@
+import logging
+import time
+from pathlib import Path
+
+from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import NoReverseMatch, URLResolver, get_resolver, reverse
+
+from notes.forms import NoteForm
+
+logger = logging.getLogger(__name__)
+
+FORMS = (NoteForm, AuthenticationForm, UserCreationForm)
+
+
+def route_names(resolver, namespace=''):
+    """Полные имена всех маршрутов, например ``notes:home``."""
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = namespace
+            if pattern.namespace:
+                prefix = f'{namespace}{pattern.namespace}:'
+            yield from route_names(pattern, prefix)
+        elif pattern.name:
+            yield namespace + pattern.name
+
+
+def warm_urls():
+    """
+    Заполняет ленивые таблицы reverse() и компилирует регулярные
+    выражения маршрутов. Маршруты без параметров ещё и разрешаются.
+    """
+    names = list(route_names(get_resolver()))
+    for name in names:
+        try:
+            url = reverse(name)
+        except NoReverseMatch:
+            # Маршрут с параметрами: таблицы его пространства имён уже
+            # заполнены попыткой reverse().
+            continue
+        get_resolver().resolve(url)
+    return len(names)
+
+
+def warm_templates():
+    """Загружает все шаблоны, чтобы они попали в кеширующий загрузчик."""
+    count = 0
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for path in Path(directory).rglob('*'):
+                if not path.is_file():
+                    continue
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except (TemplateDoesNotExist, TemplateSyntaxError):
+                    continue
+                count += 1
+    return count
+
+
+def warm_forms():
+    """Строит и отрисовывает формы, загружая шаблоны виджетов."""
+    for form_class in FORMS:
+        str(form_class())
+    return len(FORMS)
+
+
+def warm_up():
+    """
+    Делает заранее то, что иначе досталось бы первым запросам процесса.
+
+    Заполняет таблицы маршрутов, компилирует шаблоны и строит формы.
+    Время пишет в лог. Соединения с базами закрываются перед выходом:
+    их унаследовали бы воркеры, запущенные после загрузки приложения,
+    а одно соединение SQLite нельзя делить между процессами и потоками.
+    """
+    started = time.perf_counter()
+    try:
+        urls = warm_urls()
+        templates = warm_templates()
+        forms = warm_forms()
+    finally:
+        connections.close_all()
+    logger.info(
+        'Прогрев занял %.0f мс: маршрутов %d, шаблонов %d, форм %d',
+        (time.perf_counter() - started) * 1000, urls, templates, forms,
+    )